@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import JSONResponse
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Request, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+import json
 import logging
 
 from processor.json_formatter import JsonFormatter
-from processor.prompts import TOPICS_SENTIMENTS_PROMPT
-from shemas.models import AnalyzeRequest
+from processor.prompts import TOPICS_SENTIMENTS_PROMPT, TOPICS_SENTIMENTS_PACKED_PROMPT
+from shemas.models import AnalyzeRequest, JobInfo, JobResults
 from utils.time_util import log_async_execution_time
 
 router = APIRouter()
@@ -14,30 +17,95 @@ logger = logging.getLogger(__name__)
 # объект для форматирования ответов
 formatter = JsonFormatter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Тело /analyze и /jobs разбирается вручную (JsonFormatter.parse_input), схема - только для документации
+ANALYZE_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": AnalyzeRequest.model_json_schema()}},
+    }
+}
+
+
+async def stream_predictions(results: AsyncIterator[dict]) -> AsyncIterator[str]:
+    """
+    Отдаёт по строке NDJSON на каждое предсказание по мере готовности
+    и последнюю строку-итог: {"done": true, "count": N, "warnings": ...}.
+    """
+    count = 0
+    error_messages = []
+    async for item in results:
+        prediction, error = formatter.format_item(item)
+        if error:
+            error_messages.append(error)
+        if prediction is not None:
+            count += 1
+            yield prediction.model_dump_json() + "\n"
+
+    summary = {"done": True, "count": count}
+    if error_messages:
+        summary["warnings"] = "; ".join(error_messages)
+    yield json.dumps(summary, ensure_ascii=False) + "\n"
+
 @router.get("/health")
-async def health():
-    return {"status": "ok"}
+async def health(request: Request):
+    processor = request.app.state.processor
+    return {
+        "status": "ok",
+        "llm_pool": request.app.state.llm_pool.stats(),
+        "cache": processor.cache.stats() if processor.cache is not None else None,
+        "throttle": processor.throttle.stats() if processor.throttle is not None else None,
+        "batcher": request.app.state.batcher.stats() if request.app.state.batcher is not None else None,
+    }
 
 
-@router.post("/analyze", response_model=dict)
+@router.post("/analyze", response_model=dict, openapi_extra=ANALYZE_REQUEST_BODY)
 @log_async_execution_time
 async def analyze(
-        request_body: AnalyzeRequest,
-        request: Request
+        request: Request,
+        stream: bool = False
 ):
-    # Получаем processor из состояния приложения
+    """
+    Классификация отзывов.
+    С ?stream=true или заголовком Accept: application/x-ndjson ответ отдаётся потоком NDJSON:
+    строка на каждое предсказание по мере готовности и итоговая строка с warnings.
+    """
+    # Получаем processor и общий пул воркеров из состояния приложения
     processor = request.app.state.processor
+    llm_pool = request.app.state.llm_pool
+    batcher = request.app.state.batcher
 
     try:
-        # Получаем JSON из тела запроса
-        body = await request.json()
-        logger.info(f"Получен запрос на анализ: {len(body.get('data', []))} отзывов")
+        # Тело разбирается и проверяется один раз: дальше идёт готовый {id: текст}
+        body = formatter.parse_input(await request.body())
+        logger.info(f"Получен запрос на анализ: {len(body)} отзывов")
+
+        # небольшие запросы - через общую очередь отзывов всех запросов;
+        # большие и так дают полный батч и идут в пул отдельно (честная очередь между запросами)
+        if batcher is not None and len(body) >= batcher.max_items:
+            batcher = None
+
+        if stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+            if batcher is not None:
+                return StreamingResponse(stream_predictions(batcher.iter_results(body)), media_type=NDJSON_MEDIA_TYPE)
+            results = processor.iter_results(
+                system_prompt=TOPICS_SENTIMENTS_PROMPT,
+                user_prompts=body,
+                pool=llm_pool,
+                packed_system_prompt=TOPICS_SENTIMENTS_PACKED_PROMPT
+            )
+            return StreamingResponse(stream_predictions(results), media_type=NDJSON_MEDIA_TYPE)
 
-        # Обработка
-        result = processor.process_batch_threads(
+        if batcher is not None:
+            return await batcher.process_batch(body)
+
+        # Обработка (асинхронно, общий лимит запросов к LLM на весь процесс)
+        result = await processor.process_batch(
             system_prompt=TOPICS_SENTIMENTS_PROMPT,
             user_prompts=body,
-            max_workers=4
+            pool=llm_pool,
+            packed_system_prompt=TOPICS_SENTIMENTS_PACKED_PROMPT
         )
         return result
 
@@ -55,3 +123,40 @@ async def analyze(
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
+@router.post("/jobs", response_model=JobInfo, status_code=202, openapi_extra=ANALYZE_REQUEST_BODY)
+async def create_job(request: Request):
+    """
+    Фоновая классификация большого батча.
+    Возвращает job_id сразу; прогресс - GET /jobs/{job_id}, результаты - GET /jobs/{job_id}/results.
+    """
+    jobs = request.app.state.jobs
+    try:
+        return await jobs.submit(formatter.parse_input(await request.body()))
+    except ValueError as e:
+        logger.warning(f"Ошибка валидации: {e}")
+        raise HTTPException(status_code=422, detail=f"Invalid input: {str(e)}")
+
+
+@router.get("/jobs/{job_id}", response_model=JobInfo)
+async def get_job(job_id: str, request: Request):
+    job = await request.app.state.jobs.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}/results", response_model=JobResults)
+async def get_job_results(
+        job_id: str,
+        request: Request,
+        cursor: int = Query(0, ge=0),
+        limit: int = Query(500, ge=1, le=5000)
+):
+    """
+    Готовые предсказания страницами в порядке готовности.
+    Следующая страница - ?cursor=<next_cursor>; пока complete=false, новые результаты ещё будут.
+    """
+    jobs = request.app.state.jobs
+    if await jobs.get_job(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return await jobs.get_results(job_id, cursor=cursor, limit=limit)
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from ya_cloud_llm.ycloud_llm import LLMBackend
+
+logger = logging.getLogger(__name__)
+
+
+def default_instances(n_threads: int) -> int:
+    """Сколько экземпляров модели помещается на CPU узла при n_threads потоках на экземпляр."""
+    return max(1, (os.cpu_count() or 1) // n_threads)
+
+
+class LlamaCppPool:
+    """
+    Ограниченный пул экземпляров llama_cpp.Llama для одной GGUF модели.
+
+    Экземпляр Llama не потокобезопасен и обрабатывает один запрос за раз,
+    поэтому параллельность = число экземпляров, а потоков на экземпляр -
+    n_threads (instances * n_threads ~ число ядер CPU).
+    Генерация идёт в нативном коде без GIL, поэтому экземпляры работают в потоках.
+    """
+
+    def __init__(
+            self,
+            model_path: str,
+            instances: Optional[int] = None,
+            n_threads: int = 4,
+            n_ctx: int = 4096,
+            n_gpu_layers: int = 0,
+            use_system_role: bool = True,
+            max_tokens: int = 512
+    ):
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Модель не найдена: {model_path}")
+
+        # llama_cpp - опциональная зависимость, нужна только для локального бэкенда
+        from llama_cpp import Llama
+
+        self.model_path = model_path
+        self.instances = instances or default_instances(n_threads)
+        self.use_system_role = use_system_role
+        self.max_tokens = max_tokens
+
+        logger.info(f"🔧 Загружаем GGUF модель: {model_path}, экземпляров: {self.instances}, потоков на экземпляр: {n_threads}")
+        self._free: "queue.Queue" = queue.Queue()
+        for _ in range(self.instances):
+            self._free.put(Llama(
+                model_path=model_path,
+                n_ctx=n_ctx,
+                n_threads=n_threads,
+                n_gpu_layers=n_gpu_layers,
+                verbose=False,
+            ))
+        self.executor = ThreadPoolExecutor(max_workers=self.instances, thread_name_prefix="llama")
+
+    def _messages(self, user_prompt: str, system_prompt: str) -> list:
+        if self.use_system_role:
+            return [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ]
+        # модели без system role (например, gemma): склеиваем в один user-запрос
+        return [{"role": "user", "content": f"{system_prompt}\n\n{user_prompt}"}]
+
+    def generate(self, user_prompt: str, system_prompt: str, temperature: float) -> str:
+        """Берёт свободный экземпляр (или ждёт его) и генерирует ответ."""
+        llm = self._free.get()
+        try:
+            output = llm.create_chat_completion(
+                messages=self._messages(user_prompt, system_prompt),
+                max_tokens=self.max_tokens,
+                temperature=temperature,
+                top_p=0.9,
+            )
+            return output["choices"][0]["message"]["content"].strip()
+        finally:
+            self._free.put(llm)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class SyncLlamaCppLLM(LLMBackend):
+    """
+    Локальная GGUF модель через llama.cpp, синхронный вариант (process_batch_threads).
+    """
+    def __init__(self, pool: LlamaCppPool, temperature: float = 0.1):
+        super().__init__(f"gguf://{os.path.basename(pool.model_path)}", temperature)
+        self.pool = pool
+
+    def process_item(self, user_prompt: str, system_prompt: str) -> str:
+        """
+        Возвращает сырой текст от LLM.
+        При ошибке — пробрасывает исключение наверх.
+        """
+        return self.pool.generate(user_prompt, system_prompt, self.temperature)
+
+
+class AsyncLlamaCppLLM(LLMBackend):
+    """
+    Локальная GGUF модель через llama.cpp, асинхронный вариант.
+    Генерация выполняется в потоках пула и не блокирует event loop.
+    """
+    def __init__(self, pool: LlamaCppPool, temperature: float = 0.1):
+        super().__init__(f"gguf://{os.path.basename(pool.model_path)}", temperature)
+        self.pool = pool
+
+    async def process_item(self, user_prompt: str, system_prompt: str) -> str:
+        """
+        Возвращает сырой текст от LLM.
+        При ошибке — пробрасывает исключение наверх.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.pool.executor, self.pool.generate, user_prompt, system_prompt, self.temperature
+        )
@@ -19,30 +19,155 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Импортируем после настройки логгера
+from processor.classification_cache import ClassificationCache
+from processor.job_manager import JobManager, JobStore
+from processor.micro_batcher import MicroBatcher
+from processor.prompts import TOPICS_SENTIMENTS_PROMPT, TOPICS_SENTIMENTS_PACKED_PROMPT
 from processor.review_processor import YaReviewProcessor
+from processor.worker_pool import LLMWorkerPool
+from ya_cloud_llm.throttling import LLMThrottle
 from backend.app import create_app
 from backend.routes import router
 
 # Загружаем конфигурацию
+# LLM бэкенд: yandex (Yandex Cloud), llama_cpp (локальная GGUF модель на CPU, без выхода в сеть)
+# или fake (имитация квоты Yandex Cloud для проверки лимитов и повторов, см. ya_cloud_llm/fake_llm.py)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "yandex")
 FOLDER_ID = os.getenv("YANDEX_CLOUD_FOLDER")
 YA_API_KEY = os.getenv("YA_GPT_API_KEY")
-print(FOLDER_ID)
+# Локальная модель: путь к GGUF, потоков на экземпляр, экземпляров (0 - по числу ядер), контекст
+LLAMA_MODEL_PATH = os.getenv("LLAMA_MODEL_PATH", "model.gguf")
+LLAMA_THREADS = int(os.getenv("LLAMA_THREADS", "4"))
+LLAMA_INSTANCES = int(os.getenv("LLAMA_INSTANCES", "0"))
+LLAMA_N_CTX = int(os.getenv("LLAMA_N_CTX", "4096"))
+# 0 - модель без system role (gemma): системный промпт склеивается с отзывом
+LLAMA_SYSTEM_ROLE = os.getenv("LLAMA_SYSTEM_ROLE", "1") == "1"
+# Максимум одновременных запросов к LLM на весь процесс
+# (под квоту Yandex Cloud; для локальной модели по умолчанию = числу экземпляров)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "0"))
+# Кэш классификаций: размер LRU в памяти и путь к SQLite файлу (пусто - только память)
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "10000"))
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH") or None
+# Пакетный режим: сколько коротких отзывов отправлять в одном запросе (1 - выключен)
+LLM_PACK_SIZE = int(os.getenv("LLM_PACK_SIZE", "1"))
+LLM_PACK_TOKEN_BUDGET = int(os.getenv("LLM_PACK_TOKEN_BUDGET", "1500"))
+# Квота Yandex Cloud: запросов в секунду, токенов в минуту (0 - без лимита) и попыток на запрос
+LLM_RPS = float(os.getenv("LLM_RPS", "10"))
+LLM_TPM = float(os.getenv("LLM_TPM", "0"))
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "4"))
+# Фейковый бэкенд: одновременных запросов без 429, доля ответов 503 и задержка ответа
+FAKE_LLM_CAPACITY = int(os.getenv("FAKE_LLM_CAPACITY", "3"))
+FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", "0.05"))
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "200"))
+# Микробатчинг /analyze: сколько ждать отзывы из других запросов (0 - выключен) и размер батча
+LLM_BATCH_WAIT_MS = float(os.getenv("LLM_BATCH_WAIT_MS", "10"))
+LLM_BATCH_MAX_ITEMS = int(os.getenv("LLM_BATCH_MAX_ITEMS", "64"))
+# Фоновые задачи (/jobs): SQLite файл с задачами и результатами, число одновременно идущих задач
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "jobs.db")
+JOBS_CONCURRENCY = int(os.getenv("JOBS_CONCURRENCY", "2"))
 
-if not FOLDER_ID or not YA_API_KEY:
-    logger.critical("Не заданы YANDEX_CLOUD_FOLDER или YA_GPT_API_KEY")
-    exit(1)
+if LLM_BACKEND == "llama_cpp":
+    from local_llm.llama_cpp_llm import AsyncLlamaCppLLM, LlamaCppPool, SyncLlamaCppLLM
 
-# Инициализируем процессор
-processor = YaReviewProcessor(
-    folder_id=FOLDER_ID,
-    api_key=YA_API_KEY,
-    model_name="llama"  # или yandexgpt-lite
-)
+    llama_pool = LlamaCppPool(
+        model_path=LLAMA_MODEL_PATH,
+        instances=LLAMA_INSTANCES or None,
+        n_threads=LLAMA_THREADS,
+        n_ctx=LLAMA_N_CTX,
+        use_system_role=LLAMA_SYSTEM_ROLE
+    )
+    LLM_MAX_CONCURRENCY = LLM_MAX_CONCURRENCY or llama_pool.instances
+
+    # Инициализируем процессор
+    processor = YaReviewProcessor(
+        cache=ClassificationCache(max_entries=LLM_CACHE_SIZE, path=LLM_CACHE_PATH),
+        pack_size=LLM_PACK_SIZE,
+        pack_token_budget=LLM_PACK_TOKEN_BUDGET,
+        model=SyncLlamaCppLLM(llama_pool),
+        async_model=AsyncLlamaCppLLM(llama_pool)
+    )
+elif LLM_BACKEND == "fake":
+    from ya_cloud_llm.fake_llm import AsyncFakeLLM, FakeLLMServer, SyncFakeLLM
+
+    fake_server = FakeLLMServer(
+        capacity=FAKE_LLM_CAPACITY,
+        latency=FAKE_LLM_LATENCY_MS / 1000,
+        error_rate=FAKE_LLM_ERROR_RATE
+    )
+    LLM_MAX_CONCURRENCY = LLM_MAX_CONCURRENCY or 8
+    throttle = LLMThrottle(
+        rps=LLM_RPS,
+        tpm=LLM_TPM or None,
+        max_concurrency=LLM_MAX_CONCURRENCY,
+        max_attempts=LLM_MAX_ATTEMPTS
+    )
+
+    # Инициализируем процессор
+    processor = YaReviewProcessor(
+        cache=ClassificationCache(max_entries=LLM_CACHE_SIZE, path=LLM_CACHE_PATH),
+        pack_size=LLM_PACK_SIZE,
+        pack_token_budget=LLM_PACK_TOKEN_BUDGET,
+        throttle=throttle,
+        model=SyncFakeLLM(fake_server, throttle=throttle),
+        async_model=AsyncFakeLLM(fake_server, throttle=throttle)
+    )
+else:
+    print(FOLDER_ID)
+
+    if not FOLDER_ID or not YA_API_KEY:
+        logger.critical("Не заданы YANDEX_CLOUD_FOLDER или YA_GPT_API_KEY")
+        exit(1)
+
+    LLM_MAX_CONCURRENCY = LLM_MAX_CONCURRENCY or 8
+
+    # Инициализируем процессор
+    processor = YaReviewProcessor(
+        folder_id=FOLDER_ID,
+        api_key=YA_API_KEY,
+        model_name="llama",  # или yandexgpt-lite
+        cache=ClassificationCache(max_entries=LLM_CACHE_SIZE, path=LLM_CACHE_PATH),
+        pack_size=LLM_PACK_SIZE,
+        pack_token_budget=LLM_PACK_TOKEN_BUDGET,
+        throttle=LLMThrottle(
+            rps=LLM_RPS,
+            tpm=LLM_TPM or None,
+            max_concurrency=LLM_MAX_CONCURRENCY,
+            max_attempts=LLM_MAX_ATTEMPTS
+        )
+    )
 
 # Создаём приложение
 app = create_app()
 
 app.state.processor = processor
+app.state.llm_pool = LLMWorkerPool(max_concurrency=LLM_MAX_CONCURRENCY)
+app.add_event_handler("shutdown", app.state.llm_pool.close)
+app.add_event_handler("shutdown", processor.cache.close)
+if LLM_BACKEND == "llama_cpp":
+    app.add_event_handler("shutdown", llama_pool.close)
+
+app.state.batcher = MicroBatcher(
+    processor=processor,
+    system_prompt=TOPICS_SENTIMENTS_PROMPT,
+    pool=app.state.llm_pool,
+    packed_system_prompt=TOPICS_SENTIMENTS_PACKED_PROMPT,
+    max_wait_ms=LLM_BATCH_WAIT_MS,
+    max_items=LLM_BATCH_MAX_ITEMS
+) if LLM_BATCH_WAIT_MS > 0 else None
+if app.state.batcher is not None:
+    app.add_event_handler("shutdown", app.state.batcher.close)
+
+app.state.jobs = JobManager(
+    processor=processor,
+    store=JobStore(path=JOBS_DB_PATH),
+    system_prompt=TOPICS_SENTIMENTS_PROMPT,
+    pool=app.state.llm_pool,
+    packed_system_prompt=TOPICS_SENTIMENTS_PACKED_PROMPT,
+    runners=JOBS_CONCURRENCY
+)
+app.add_event_handler("startup", app.state.jobs.start)
+app.add_event_handler("shutdown", app.state.jobs.stop)
+app.add_event_handler("shutdown", app.state.jobs.store.close)
 app.include_router(router)
 
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Нормализует текст отзыва для сравнения: обрезает края и схлопывает пробелы.
+    Регистр и пунктуацию не трогаем - они влияют на ответ модели.
+    """
+    return " ".join(text.split())
+
+
+class ClassificationCache:
+    """
+    Кэш ответов LLM по содержимому запроса.
+
+    Ключ - sha256 от (нормализованный текст, системный промпт, URI модели, температура),
+    поэтому смена промпта или модели автоматически даёт новые ключи.
+
+    Два уровня:
+    - LRU в памяти на max_entries записей;
+    - (опционально) SQLite файл по пути path - переживает рестарты и общий для воркеров.
+
+    Потокобезопасен: используется и из потоков (process_batch_threads), и из event loop.
+    В event loop - через get_async/set_async: LRU проверяется сразу, запросы к SQLite
+    уходят в поток (asyncio.to_thread) и не блокируют loop.
+    У LRU и SQLite свои блокировки, поэтому поиск в памяти не ждёт диска.
+    """
+
+    def __init__(self, max_entries: int = 10000, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS classification_cache ("
+                "key TEXT PRIMARY KEY, answer TEXT NOT NULL, "
+                "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+            )
+            logger.info(f"💾 Дисковый кэш классификаций: {path}")
+
+    @staticmethod
+    def make_key(text: str, system_prompt: str, model_uri: str, temperature: float) -> str:
+        payload = "\x1f".join([normalize_text(text), system_prompt, model_uri, repr(temperature)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Возвращает сохранённый ответ модели или None."""
+        answer = self._get_memory(key)
+        if answer is None:
+            answer = self._get_disk(key)
+        return answer
+
+    async def get_async(self, key: str) -> Optional[str]:
+        """То же, что get, но поиск в SQLite выполняется в потоке."""
+        answer = self._get_memory(key)
+        if answer is None:
+            if self._db is None:
+                return self._get_disk(key)
+            answer = await asyncio.to_thread(self._get_disk, key)
+        return answer
+
+    def set(self, key: str, answer: str) -> None:
+        with self._lock:
+            self._remember(key, answer)
+        self._set_disk(key, answer)
+
+    async def set_async(self, key: str, answer: str) -> None:
+        """То же, что set, но запись в SQLite выполняется в потоке."""
+        with self._lock:
+            self._remember(key, answer)
+        if self._db is not None:
+            await asyncio.to_thread(self._set_disk, key, answer)
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        with self._lock:
+            answer = self._memory.get(key)
+            if answer is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            return answer
+
+    def _get_disk(self, key: str) -> Optional[str]:
+        """Ищет ответ в SQLite (промах в памяти уже случился) и поднимает его в LRU."""
+        row = None
+        with self._db_lock:
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT answer FROM classification_cache WHERE key = ?", (key,)
+                ).fetchone()
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self._remember(key, row[0])
+            self.disk_hits += 1
+            return row[0]
+
+    def _set_disk(self, key: str, answer: str) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO classification_cache (key, answer) VALUES (?, ?)",
+                    (key, answer)
+                )
+
+    def _remember(self, key: str, answer: str) -> None:
+        """Кладёт ответ в LRU, вытесняя самые старые записи."""
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = answer
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
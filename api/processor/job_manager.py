@@ -0,0 +1,260 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import uuid
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from processor.json_formatter import JsonFormatter
+from processor.review_processor import YaReviewProcessor
+from processor.worker_pool import LLMWorkerPool
+
+logger = logging.getLogger(__name__)
+
+
+class JobStore:
+    """
+    Хранилище фоновых задач в SQLite: задачи, их отзывы и готовые предсказания.
+    Задачи переживают рестарт сервиса: необработанные отзывы дообрабатываются.
+    """
+
+    def __init__(self, path: str = "jobs.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                processed INTEGER NOT NULL DEFAULT 0,
+                warnings INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE IF NOT EXISTS job_items (
+                job_id TEXT NOT NULL,
+                item_id INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                done INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (job_id, item_id)
+            );
+            CREATE INDEX IF NOT EXISTS ix_job_items_pending ON job_items (job_id, done);
+            -- seq растёт в порядке готовности и служит курсором для постраничной выдачи
+            CREATE TABLE IF NOT EXISTS job_results (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                item_id INTEGER NOT NULL,
+                prediction TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_job_results_job_seq ON job_results (job_id, seq);
+        """)
+
+    def create_job(self, job_id: str, items: Dict[int, str]) -> None:
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.execute(
+                "INSERT INTO jobs (id, status, total) VALUES (?, 'queued', ?)", (job_id, len(items))
+            )
+            self._db.executemany(
+                "INSERT INTO job_items (job_id, item_id, text) VALUES (?, ?, ?)",
+                [(job_id, item_id, text) for item_id, text in items.items()]
+            )
+            self._db.execute("COMMIT")
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT id, status, total, processed, warnings, error, created_at, updated_at "
+                "FROM jobs WHERE id = ?", (job_id,)
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        columns = [column[0] for column in cursor.description]
+        job = dict(zip(columns, row))
+        job["job_id"] = job.pop("id")
+        return job
+
+    def set_status(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (status, error, job_id)
+            )
+
+    def unfinished_jobs(self) -> List[str]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id FROM jobs WHERE status IN ('queued', 'running') ORDER BY created_at"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def pending_items(self, job_id: str, limit: int) -> Dict[int, str]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT item_id, text FROM job_items WHERE job_id = ? AND done = 0 LIMIT ?",
+                (job_id, limit)
+            ).fetchall()
+        return dict(rows)
+
+    def save_results(self, job_id: str, results: List[Tuple[int, str, bool]]) -> None:
+        """
+        Сохраняет готовые предсказания одной транзакцией.
+        results - список (item_id, предсказание в JSON, есть ли предупреждение).
+        """
+        if not results:
+            return
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT INTO job_results (job_id, item_id, prediction) VALUES (?, ?, ?)",
+                [(job_id, item_id, prediction) for item_id, prediction, _ in results]
+            )
+            self._db.executemany(
+                "UPDATE job_items SET done = 1 WHERE job_id = ? AND item_id = ?",
+                [(job_id, item_id) for item_id, _, _ in results]
+            )
+            self._db.execute(
+                "UPDATE jobs SET processed = processed + ?, warnings = warnings + ?, "
+                "updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (len(results), sum(1 for *_, warning in results if warning), job_id)
+            )
+            self._db.execute("COMMIT")
+
+    def results_page(self, job_id: str, cursor: int, limit: int) -> List[Tuple[int, str]]:
+        with self._lock:
+            return self._db.execute(
+                "SELECT seq, prediction FROM job_results WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (job_id, cursor, limit)
+            ).fetchall()
+
+    def close(self) -> None:
+        # дожидаемся записи, которая ещё идёт в потоке
+        with self._lock:
+            self._db.close()
+
+
+class JobManager:
+    """
+    Очередь фоновых задач классификации больших батчей.
+
+    - submit валидирует вход, сохраняет отзывы в JobStore и ставит задачу в очередь;
+    - runners задач обрабатываются одновременно, отзывы идут порциями по chunk_size
+      через YaReviewProcessor.iter_results и общий пул воркеров;
+    - результаты сохраняются по мере готовности, после рестарта задача продолжается
+      с необработанных отзывов.
+
+    Запросы к JobStore (sqlite3, блокирующие) выполняются в потоках через asyncio.to_thread,
+    чтобы запись больших задач не останавливала event loop.
+    """
+
+    def __init__(
+            self,
+            processor: YaReviewProcessor,
+            store: JobStore,
+            system_prompt: str,
+            pool: Optional[LLMWorkerPool] = None,
+            packed_system_prompt: Optional[str] = None,
+            runners: int = 2,
+            chunk_size: int = 200
+    ):
+        self.processor = processor
+        self.store = store
+        self.system_prompt = system_prompt
+        self.packed_system_prompt = packed_system_prompt
+        self.pool = pool
+        self.runners = runners
+        self.chunk_size = chunk_size
+        self.formatter = JsonFormatter()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Запускает обработчики и возвращает в очередь незавершённые задачи."""
+        self._queue = asyncio.Queue()
+        unfinished = await asyncio.to_thread(self.store.unfinished_jobs)
+        for job_id in unfinished:
+            self._queue.put_nowait(job_id)
+        if unfinished:
+            logger.info(f"🔁 Возобновляем незавершённые задачи: {len(unfinished)}")
+
+        self._tasks = [asyncio.create_task(self._run(), name=f"job-runner-{i}") for i in range(self.runners)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, user_prompts: Union[Dict, str]) -> Dict[str, Any]:
+        """
+        Создаёт задачу. При невалидном вводе - ValueError (как JsonFormatter.format_input).
+        """
+        items = self.formatter.format_input(user_prompts)
+        job_id = uuid.uuid4().hex
+        await asyncio.to_thread(self.store.create_job, job_id, items)
+        self._queue.put_nowait(job_id)
+        logger.info(f"📥 Новая задача {job_id}: {len(items)} отзывов")
+        return await self.get_job(job_id)
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Состояние задачи или None, если её нет."""
+        return await asyncio.to_thread(self.store.get_job, job_id)
+
+    async def _run(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._process(job_id)
+            except asyncio.CancelledError:
+                # остановка сервиса - задача останется 'running' и продолжится после рестарта
+                raise
+            except Exception as e:
+                logger.error(f"❌ Ошибка задачи {job_id}: {e}", exc_info=True)
+                await asyncio.to_thread(self.store.set_status, job_id, "failed", str(e))
+
+    async def _process(self, job_id: str) -> None:
+        await asyncio.to_thread(self.store.set_status, job_id, "running")
+
+        while True:
+            items = await asyncio.to_thread(self.store.pending_items, job_id, self.chunk_size)
+            if not items:
+                break
+
+            chunk = {"data": [{"id": item_id, "text": text} for item_id, text in items.items()]}
+            results = []
+            async for item in self.processor.iter_results(
+                    system_prompt=self.system_prompt,
+                    user_prompts=chunk,
+                    pool=self.pool,
+                    packed_system_prompt=self.packed_system_prompt
+            ):
+                prediction, error = self.formatter.format_item(item)
+                if prediction is None:
+                    raise ValueError(error)
+                results.append((prediction.id, prediction.model_dump_json(), error is not None))
+
+            await asyncio.to_thread(self.store.save_results, job_id, results)
+
+        await asyncio.to_thread(self.store.set_status, job_id, "completed")
+        logger.info(f"✅ Задача {job_id} завершена")
+
+    async def get_results(self, job_id: str, cursor: int = 0, limit: int = 500) -> Dict[str, Any]:
+        """
+        Страница готовых результатов после cursor (в порядке готовности).
+        complete=True - задача завершена и результатов после next_cursor больше не будет.
+        """
+        job = await self.get_job(job_id)
+        rows = await asyncio.to_thread(self.store.results_page, job_id, cursor, limit)
+        next_cursor = rows[-1][0] if rows else cursor
+        return {
+            "job_id": job_id,
+            "predictions": [json.loads(prediction) for _, prediction in rows],
+            "next_cursor": next_cursor,
+            "complete": job["status"] in ("completed", "failed") and len(rows) < limit,
+        }
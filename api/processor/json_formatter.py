@@ -1,9 +1,9 @@
-from typing import Dict, Any, List, Union
-import json
+from typing import Dict, Any, List, Optional, Tuple, Union
 
+import orjson
 from pydantic import ValidationError
 
-from shemas.models import InputData, Prediction, OutputData
+from shemas.models import InputData, Prediction, OutputData, ReviewTexts
 from utils.json_utils import parse_model_response
 
 
@@ -14,20 +14,56 @@ class JsonFormatter:
     """
 
     @staticmethod
-    def format_input(user_prompts: Union[Dict, str]) -> Union[Dict[int, str], Dict[str, str]]:
+    def parse_input(body: Union[bytes, str]) -> ReviewTexts:
+        """
+        Разбирает тело запроса за один проход (orjson) и проверяет его один раз.
+        Обычный корректный вход проверяется простым циклом без создания Pydantic моделей,
+        при любом отклонении - полная проверка InputData (те же правила и тексты ошибок).
+        """
+        try:
+            data_dict = orjson.loads(body)
+        except orjson.JSONDecodeError as e:
+            raise ValueError(f"Невозможно распарсить JSON: {str(e)}")
+
+        texts = JsonFormatter._fast_validate(data_dict)
+        if texts is None:
+            texts = JsonFormatter.format_input(data_dict)
+        return ReviewTexts(texts)
+
+    @staticmethod
+    def _fast_validate(data_dict: Any) -> Optional[Dict[int, str]]:
+        """{id: text} для заведомо корректного входа, иначе None."""
+        if not isinstance(data_dict, dict):
+            return None
+        items = data_dict.get("data")
+        if not isinstance(items, list) or not items:
+            return None
+
+        texts = {}
+        for item in items:
+            if not isinstance(item, dict):
+                return None
+            item_id = item.get("id")
+            text = item.get("text")
+            if type(item_id) is not int or type(text) is not str or not text:
+                return None
+            texts[item_id] = text
+        return texts
+
+    @staticmethod
+    def format_input(user_prompts: Union[Dict, str, bytes]) -> Union[Dict[int, str], Dict[str, str]]:
+        # уже проверенный вход (parse_input) не проверяем повторно
+        if isinstance(user_prompts, ReviewTexts):
+            return user_prompts
+        if isinstance(user_prompts, (bytes, str)):
+            return JsonFormatter.parse_input(user_prompts)
+
         try:
-            # Парсим JSON
-            if isinstance(user_prompts, str):
-                data_dict = json.loads(user_prompts, encoding='utf-8')
-            else:
-                data_dict = user_prompts
             # Валидируем с помощью Pydantic
-            input_data = InputData(**data_dict)
+            input_data = InputData(**user_prompts)
             # Преобразуем в {id: text}
             return {item.id: item.text for item in input_data.data}
 
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Невозможно распарсить JSON: {str(e)}")
         except ValidationError as e:
             error_msg = "; ".join([f"{err['loc'][-1]}: {err['msg']}" for err in e.errors()])
             raise ValueError(f"Невалидные данные: {error_msg}")
@@ -35,50 +71,72 @@ class JsonFormatter:
             raise ValueError(f"Ошибка обработки ввода: {str(e)}")
 
     @staticmethod
-    def format_output(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def format_item(item: Dict[Any, Any]) -> Tuple[Optional[Prediction], Optional[str]]:
         """
-        Формирует финальный ответ на основе списка результатов.
-        Использует OutputData для валидации/формирования.
+        Формирует предсказание для одного результата {id: ответ модели}.
+        Возвращает (предсказание или None, текст ошибки или None).
         """
-        predictions = []
-        error_messages = []
+        if "errors" in item:
+            return None, item["errors"]
 
-        for item in results:
-            if "errors" in item:
-                error_messages.append(item["errors"])
-                continue
-
-            item_id = list(item.keys())[0]
-            raw_response = item.get(item_id)
-            error = item.get("error")
+        item_id = list(item.keys())[0]
+        raw_response = item.get(item_id)
+        error = item.get("error")
 
-            if error:
-                error_messages.append(f"item_id={item_id}: {error}")
-                predictions.append(Prediction(id=item_id))
-                continue
+        if error:
+            return Prediction(id=item_id), f"item_id={item_id}: {error}"
 
-            if not raw_response:
-                predictions.append(Prediction(id=item_id))
-                continue
+        if not raw_response:
+            return Prediction(id=item_id), None
 
+        try:
+            warning = None
             try:
+                parsed = parse_model_response(raw_response, repair=False)
+                repaired = False
+            except ValueError:
+                # оборванный ответ: достраиваем, но сообщаем - часть тем могла потеряться
                 parsed = parse_model_response(raw_response)
-                pred_list = parsed.get("predictions", [])
+                repaired = True
+                warning = f"item_id={item_id}: ответ модели оборван, JSON достроен"
+            pred_list = parsed.get("predictions", [])
+
+            topics = pred_list.get("topics", [])
+            sentiments = pred_list.get("sentiments", [])
+            if not isinstance(topics, list): topics = []
+            if not isinstance(sentiments, list): sentiments = []
+
+            # в достроенном ответе разная длина списков - обрыв посреди пары тема/тональность
+            if repaired and len(topics) != len(sentiments):
+                return Prediction(id=item_id), (
+                    f"Ошибка парсинга LLM для item_id={item_id}: "
+                    f"тем {len(topics)}, тональностей {len(sentiments)}"
+                )
+
+            return Prediction(
+                id=item_id,
+                topics=[str(t) for t in topics],
+                sentiments=[str(s) for s in sentiments]
+            ), warning
 
-                topics = pred_list.get("topics", [])
-                sentiments = pred_list.get("sentiments", [])
-                if not isinstance(topics, list): topics = []
-                if not isinstance(sentiments, list): sentiments = []
+        except Exception as e:
+            return Prediction(id=item_id), f"Ошибка парсинга LLM для item_id={item_id}: {e}"
 
-                predictions.append(Prediction(
-                    id=item_id,
-                    topics=[str(t) for t in topics],
-                    sentiments=[str(s) for s in sentiments]
-                ))
+    @staticmethod
+    def format_output(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Формирует финальный ответ на основе списка результатов.
+        Использует OutputData для валидации/формирования.
+        """
+        predictions = []
+        error_messages = []
 
-            except Exception as e:
-                error_messages.append(f"Ошибка парсинга LLM для item_id={item_id}: {e}")
-                predictions.append(Prediction(id=item_id))
+        for item in results:
+            prediction, error = JsonFormatter.format_item(item)
+            if prediction is not None:
+                predictions.append(prediction)
+            if error:
+                error_messages.append(error)
 
         # Создаём объект вывода
         output_data = OutputData(
@@ -87,4 +145,4 @@ class JsonFormatter:
         )
 
         # Конвертируем в словарь
-        return output_data.model_dump(exclude_none=True)
\ No newline at end of file
+        return output_data.model_dump(exclude_none=True)
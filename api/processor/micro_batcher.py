@@ -0,0 +1,160 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple, Union
+
+from processor.review_processor import YaReviewProcessor
+from processor.worker_pool import LLMWorkerPool
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Общая очередь отзывов из всех одновременных запросов /analyze.
+
+    Отзывы копятся до max_wait_ms миллисекунд или max_items штук и уходят
+    одним батчем в YaReviewProcessor.iter_results: одинаковые тексты из разных
+    запросов - один вызов модели, короткие отзывы разных запросов упаковываются
+    вместе (если включён пакетный режим), запросы к модели идут через общий пул.
+    Каждый вызывающий получает ответ через свою future.
+
+    Живёт в app.state.batcher, работает в event loop приложения.
+    """
+
+    def __init__(
+            self,
+            processor: YaReviewProcessor,
+            system_prompt: str,
+            pool: Optional[LLMWorkerPool] = None,
+            packed_system_prompt: Optional[str] = None,
+            max_wait_ms: float = 10,
+            max_items: int = 64
+    ):
+        self.processor = processor
+        self.system_prompt = system_prompt
+        self.packed_system_prompt = packed_system_prompt
+        self.pool = pool
+        self.max_wait_ms = max_wait_ms
+        self.max_items = max_items
+
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._dispatches: Set[asyncio.Task] = set()
+
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, text: str) -> "asyncio.Future[Any]":
+        """
+        Ставит отзыв в очередь. Future вернёт ответ модели (или [] при ошибке,
+        как и iter_results).
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+        return future
+
+    async def iter_results(self, user_prompts: Union[Dict, str]) -> AsyncIterator[Dict[Any, Any]]:
+        """
+        То же, что YaReviewProcessor.iter_results, но отзывы идут через общую очередь.
+        Отдаёт {id: ответ модели} по мере готовности (или {"errors": ...} при невалидном вводе).
+        """
+        try:
+            user_prompts_formatted = self.processor.formatter.format_input(user_prompts)
+        except ValueError as e:
+            logger.error(f'❌ Ошибка при валидации входных данных: {e}')
+            yield {"errors": str(e)}
+            return
+
+        future_to_id = {self.submit(text): item_id for item_id, text in user_prompts_formatted.items()}
+        pending = set(future_to_id)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    item_id = future_to_id[future]
+                    try:
+                        answer = future.result()
+                    except Exception as e:
+                        logger.error(f"❌ Ошибка при обработке item_id={item_id}: {e}")
+                        answer = []
+                    yield {item_id: answer}
+        finally:
+            # клиент отключился - его отзывы не попадут в следующий батч
+            for future in pending:
+                future.cancel()
+
+    async def process_batch(self, user_prompts: Union[Dict, str]) -> Dict:
+        """То же, что YaReviewProcessor.process_batch, но через общую очередь."""
+        results = [result async for result in self.iter_results(user_prompts)]
+        sorted_results = sorted(results, key=lambda d: next(iter(d.keys())))
+        return self.processor.formatter.format_output(sorted_results)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        # вызывающие, которые уже ушли (отменили future), в батч не попадают
+        items = [(text, future) for text, future in self._pending if not future.done()]
+        self._pending = []
+        if not items:
+            return
+
+        self.batches += 1
+        self.items += len(items)
+        task = asyncio.create_task(self._dispatch(items))
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, items: List[Tuple[str, asyncio.Future]]) -> None:
+        logger.debug(f"📦 Микробатч: {len(items)} отзывов")
+        # id внутри батча - позиция в очереди, у разных запросов id могут совпадать
+        batch = {"data": [{"id": index, "text": text} for index, (text, _) in enumerate(items)]}
+        try:
+            async for result in self.processor.iter_results(
+                    system_prompt=self.system_prompt,
+                    user_prompts=batch,
+                    pool=self.pool,
+                    packed_system_prompt=self.packed_system_prompt
+            ):
+                if "errors" in result:
+                    raise ValueError(result["errors"])
+                index, answer = next(iter(result.items()))
+                future = items[index][1]
+                if not future.done():
+                    future.set_result(answer)
+        except Exception as e:
+            logger.error(f"❌ Ошибка микробатча ({len(items)} отзывов): {e}", exc_info=True)
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            for _, future in items:
+                future.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "max_wait_ms": self.max_wait_ms,
+            "max_items": self.max_items,
+            "queued": len(self._pending),
+            "batches": self.batches,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
+
+    async def close(self) -> None:
+        """Отменяет ожидающие отзывы и батчи в обработке."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for _, future in self._pending:
+            future.cancel()
+        self._pending = []
+        for task in self._dispatches:
+            task.cancel()
+        await asyncio.gather(*self._dispatches, return_exceptions=True)
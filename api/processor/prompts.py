@@ -12,7 +12,8 @@ products_cat = [
     "Прочие услуги"
 ]
 
-TOPICS_SENTIMENTS_PROMPT = f'''
+# Общие правила классификации для одиночного и пакетного режимов
+_CLASSIFICATION_RULES = f'''
 Ты — аналитик, работающий с отзывами о банковских услугах и продуктах.
 Твоя задача: выделить в отзыве все смысловые фрагменты, связанные с банковскими продуктами и услугами,
 и для каждого фрагмента строго определить категорию продукта и тональность отзыва (сентимент).
@@ -24,13 +25,33 @@ TOPICS_SENTIMENTS_PROMPT = f'''
 по правилам арифметики. Значения "положительно", "отрицательно", "нейтрально" соответствуют +1, -1, 0.
 Например, "условия по картам хорошие, но цифры с пластика быстро стираются". -1 +1 = 0 -> "нейтрально"
 Не придумывай новые значения, используй только указанные.
-Вывод — строго в формате JSON. Ключ "predictions" должен содержать словарь со структурой:
-        {{
+'''
+
+TOPICS_SENTIMENTS_PROMPT = _CLASSIFICATION_RULES + '''Вывод — строго в формате JSON. Ключ "predictions" должен содержать словарь со структурой:
+        {
         "topics": ["категория1", "категория2"],
         "sentiments": ["сентимент1", "сентимент2"]
-        }}
+        }
 Массив "sentiments" имеет тот же размер что и "topics". Тональности идут в порядке соответствия темам.
 Если в запросе нет ничего похожего на банковский отзыв - верни пустые списки "topics": [], "sentiments": []
 Ответ должен быть валидным JSON-объектом вышеуказанной структуры без каких-либо комментариев, 
 маркдаун-разметки, знаков переноса строки и т.п
-'''
\ No newline at end of file
+'''
+
+# Пакетный режим: несколько отзывов в одном запросе, ответы по id
+TOPICS_SENTIMENTS_PACKED_PROMPT = _CLASSIFICATION_RULES + '''
+На вход подаётся JSON-массив отзывов вида [{"id": 1, "text": "отзыв"}, ...].
+Каждый отзыв анализируется независимо от остальных.
+Вывод — строго в формате JSON. Ключ "predictions" должен содержать словарь, где ключ - id отзыва (строкой),
+а значение - словарь со структурой:
+        {
+        "topics": ["категория1", "категория2"],
+        "sentiments": ["сентимент1", "сентимент2"]
+        }
+Например: {"predictions": {"1": {"topics": ["Карты"], "sentiments": ["положительно"]}, "2": {"topics": [], "sentiments": []}}}
+Ответ должен содержать все id из запроса.
+Массив "sentiments" имеет тот же размер что и "topics". Тональности идут в порядке соответствия темам.
+Если в отзыве нет ничего похожего на банковский отзыв - верни для него пустые списки "topics": [], "sentiments": []
+Ответ должен быть валидным JSON-объектом вышеуказанной структуры без каких-либо комментариев,
+маркдаун-разметки, знаков переноса строки и т.п
+'''
@@ -1,8 +1,15 @@
+import asyncio
+import json
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, Union, List, Any
+from functools import partial
+from typing import AsyncIterator, Dict, Union, List, Any, Optional
 
+from processor.classification_cache import ClassificationCache, normalize_text
 from processor.json_formatter import JsonFormatter
-from ya_cloud_llm.ycloud_llm import SyncYCloudLLM
+from processor.worker_pool import LLMWorkerPool
+from utils.json_utils import parse_model_response
+from ya_cloud_llm.throttling import LLMThrottle, estimate_tokens
+from ya_cloud_llm.ycloud_llm import AsyncYCloudLLM, LLMBackend, SyncYCloudLLM
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,19 +19,178 @@ class YaReviewProcessor:
     """
     Класс для обработки отзывов с использованием Yandex Foundation Models.
     """
-    def __init__(self, folder_id: str, api_key: str, model_name: str = "yandexgpt-lite"):
-        self.model = SyncYCloudLLM(folder_id=folder_id, api_key=api_key, model_name=model_name)
+    def __init__(
+            self,
+            folder_id: Optional[str] = None,
+            api_key: Optional[str] = None,
+            model_name: str = "yandexgpt-lite",
+            cache: Optional[ClassificationCache] = None,
+            pack_size: int = 1,
+            pack_token_budget: int = 1500,
+            throttle: Optional[LLMThrottle] = None,
+            model: Optional[LLMBackend] = None,
+            async_model: Optional[LLMBackend] = None
+    ):
+        # по умолчанию - Yandex Cloud; другой бэкенд (например, локальная GGUF модель)
+        # передаётся готовыми model (синхронный) и async_model (асинхронный)
+        if (model is None) != (async_model is None):
+            raise ValueError("model и async_model передаются вместе (одна модель - один бэкенд)")
+        if model is None:
+            # throttle (лимиты квоты, повторы) общий для обеих моделей - квота одна на процесс
+            model = SyncYCloudLLM(folder_id=folder_id, api_key=api_key, model_name=model_name, throttle=throttle)
+            async_model = AsyncYCloudLLM(folder_id=folder_id, api_key=api_key, model_name=model_name, throttle=throttle)
+        self.model = model
+        self.async_model = async_model
+        self.throttle = throttle
         self.formatter = JsonFormatter()
+        # кэш ответов модели (None - без кэша)
+        self.cache = cache
+        # пакетный режим: до pack_size коротких отзывов в одном запросе (1 - выключен),
+        # суммарно не больше pack_token_budget токенов текста
+        self.pack_size = pack_size
+        self.pack_token_budget = pack_token_budget
+
+    def _cache_key(self, user_prompt: str, system_prompt: str) -> str:
+        return self.cache.make_key(user_prompt, system_prompt, self.model.model_uri, self.model.temperature)
+
+    @staticmethod
+    def _cacheable(answer: str) -> bool:
+        '''
+        В кэш попадает ответ, только если из него извлекается полный (не достроенный) JSON,
+        чтобы неудачный или оборванный ответ модели не закрепился в кэше.
+        '''
+        try:
+            parse_model_response(answer, repair=False)
+        except ValueError:
+            return False
+        return True
+
+    def _cache_answer(self, key: str, answer: str) -> None:
+        if self._cacheable(answer):
+            self.cache.set(key, answer)
+
+    async def _cache_answer_async(self, key: str, answer: str) -> None:
+        if self._cacheable(answer):
+            await self.cache.set_async(key, answer)
+
+    @staticmethod
+    def group_duplicates(user_prompts_formatted: Dict[int, str]) -> Dict[int, List[int]]:
+        '''
+        Группирует id с одинаковым (после нормализации) текстом, чтобы вызывать модель один раз на текст.
+        Возвращает {id первого вхождения: [все id с этим текстом]}.
+        '''
+        first_id_by_text = {}
+        groups = {}
+        for item_id, text in user_prompts_formatted.items():
+            first_id = first_id_by_text.setdefault(normalize_text(text), item_id)
+            groups.setdefault(first_id, []).append(item_id)
+
+        duplicates = len(user_prompts_formatted) - len(groups)
+        if duplicates:
+            logger.info(f"♻️ Одинаковых текстов в батче: {duplicates}, запросов к модели: {len(groups)}")
+        return groups
 
     def process_item(self, user_prompt: str, system_prompt: str, item_id: int) -> Dict[int, str]:
         '''
         Функция для обработки отзыва. Без форматирования.
         На входе - отзыв и id, на выходе - словарь {id : ответ модели}.
+        При попадании в кэш модель не вызывается.
+        '''
+        if self.cache is None:
+            return {item_id: self.model.process_item(user_prompt, system_prompt)}
+
+        key = self._cache_key(user_prompt, system_prompt)
+        answer = self.cache.get(key)
+        if answer is None:
+            answer = self.model.process_item(user_prompt, system_prompt)
+            self._cache_answer(key, answer)
+        return {item_id: answer}
+
+    async def process_item_async(self, user_prompt: str, system_prompt: str, item_id: int) -> Dict[int, str]:
+        '''
+        Асинхронный вариант process_item. Не блокирует event loop.
+        На входе - отзыв и id, на выходе - словарь {id : ответ модели}.
+        При попадании в кэш модель не вызывается.
         '''
+        if self.cache is None:
+            return {item_id: await self.async_model.process_item(user_prompt, system_prompt)}
 
-        answer = self.model.process_item(user_prompt, system_prompt)
+        key = self._cache_key(user_prompt, system_prompt)
+        answer = await self.cache.get_async(key)
+        if answer is None:
+            answer = await self.async_model.process_item(user_prompt, system_prompt)
+            await self._cache_answer_async(key, answer)
         return {item_id: answer}
 
+    def plan_packs(self, user_prompts_formatted: Dict[int, str], item_ids: List[int]) -> List[List[int]]:
+        '''
+        Раскладывает отзывы по пакетам не больше pack_size штук и pack_token_budget токенов.
+        Длинные отзывы (больше половины бюджета) идут отдельными запросами.
+        '''
+        packs = []
+        current, current_tokens = [], 0
+        for item_id in item_ids:
+            tokens = estimate_tokens(user_prompts_formatted[item_id])
+            if self.pack_size <= 1 or tokens > self.pack_token_budget // 2:
+                packs.append([item_id])
+                continue
+            if current and (len(current) >= self.pack_size or current_tokens + tokens > self.pack_token_budget):
+                packs.append(current)
+                current, current_tokens = [], 0
+            current.append(item_id)
+            current_tokens += tokens
+        if current:
+            packs.append(current)
+        return packs
+
+    @staticmethod
+    def _valid_prediction(entry: Any) -> bool:
+        return (
+            isinstance(entry, dict)
+            and isinstance(entry.get("topics"), list)
+            and isinstance(entry.get("sentiments"), list)
+            and len(entry["topics"]) == len(entry["sentiments"])
+        )
+
+    async def process_pack_async(self, user_prompts: Dict[int, str], system_prompt: str) -> Dict[int, str]:
+        '''
+        Обрабатывает несколько отзывов одним запросом (промпт TOPICS_SENTIMENTS_PACKED_PROMPT).
+        На входе - {id: отзыв}, на выходе - {id: ответ} в формате одиночного ответа модели,
+        только для id с валидным предсказанием. Отсутствующие id обрабатываются вызывающим по одному.
+        '''
+        answers = {}
+        keys = {}
+        if self.cache is not None:
+            for item_id, text in user_prompts.items():
+                keys[item_id] = self._cache_key(text, system_prompt)
+                cached = await self.cache.get_async(keys[item_id])
+                if cached is not None:
+                    answers[item_id] = cached
+
+        to_ask = [{"id": item_id, "text": text} for item_id, text in user_prompts.items() if item_id not in answers]
+        if not to_ask:
+            return answers
+
+        raw = await self.async_model.process_item(json.dumps(to_ask, ensure_ascii=False), system_prompt)
+        try:
+            predictions = parse_model_response(raw).get("predictions", {})
+        except (ValueError, AttributeError) as e:
+            logger.warning(f"⚠️ Не удалось разобрать пакетный ответ ({len(to_ask)} отзывов): {e}")
+            return answers
+        if not isinstance(predictions, dict):
+            return answers
+
+        for item in to_ask:
+            entry = predictions.get(str(item["id"]))
+            if not self._valid_prediction(entry):
+                continue
+            answer = json.dumps({"predictions": entry}, ensure_ascii=False)
+            answers[item["id"]] = answer
+            if self.cache is not None:
+                await self.cache.set_async(keys[item["id"]], answer)
+
+        return answers
+
     def process_batch_threads(
             self,
             system_prompt: str,
@@ -40,27 +206,29 @@ class YaReviewProcessor:
             # проверяем входные данные на соответствие шаблону. приводим к единому формату {id : отзыв}
             user_prompts_formatted = self.formatter.format_input(user_prompts)
 
+            # одинаковые тексты отправляем в модель один раз
+            groups = self.group_duplicates(user_prompts_formatted)
+
             # запускаем обработку в потоках
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
                 # Создаём задачи: submit(метод, user_prompt, system_prompt, item_id)
                 future_to_id = {}
 
-                for item_id, text in user_prompts_formatted.items():
+                for item_id in groups:
+                    text = user_prompts_formatted[item_id]
                     logger.debug(f"🧵 Готовим задачу: item_id={item_id}, тип={type(item_id)}, текст='{text[:50]}...'")
                     future = executor.submit(self.process_item, text, system_prompt, item_id)
                     future_to_id[future] = item_id
 
-                # Собираем результаты по мере готовности
+                # Собираем результаты по мере готовности и раздаём ответ всем id с тем же текстом
                 for future in as_completed(future_to_id):
+                    item_id = future_to_id[future]
                     try:
-                        result = future.result()
-                        results.append(result)
+                        answer = future.result()[item_id]
                     except Exception as e:
-                        item_id = future_to_id[future]
                         logger.error(f"❌ Ошибка при обработке item_id={item_id}: {e}")
-                        results.append({
-                            item_id : []
-                        })
+                        answer = []
+                    results.extend({duplicate_id: answer} for duplicate_id in groups[item_id])
 
         except Exception as e:
             logger.error(f'❌ Ошибка при валидации входных данных: {e}')
@@ -71,9 +239,109 @@ class YaReviewProcessor:
         sorted_results = sorted(results, key=lambda d: next(iter(d.keys())))
         return self.formatter.format_output(sorted_results)
 
+    async def iter_results(
+            self,
+            system_prompt: str,
+            user_prompts: Union[Dict, str],
+            pool: Optional[LLMWorkerPool] = None,
+            max_concurrency: int = 4,
+            packed_system_prompt: Optional[str] = None
+    ) -> AsyncIterator[Dict[Any, Any]]:
+        """
+        Асинхронная параллельная обработка с выдачей результатов по мере готовности.
+        Отдаёт словари {id: ответ модели} (или {"errors": ...} при невалидном вводе),
+        которые понимает JsonFormatter.
+        Если передан pool - задачи выполняются общим пулом процесса (глобальный лимит
+        и честная очередь между запросами), иначе не более max_concurrency запросов этого батча.
+        Если передан packed_system_prompt и pack_size > 1 - короткие отзывы отправляются пакетами,
+        id без валидного ответа в пакете переобрабатываются по одному с system_prompt.
+        """
+        try:
+            # проверяем входные данные на соответствие шаблону. приводим к единому формату {id : отзыв}
+            user_prompts_formatted = self.formatter.format_input(user_prompts)
+        except ValueError as e:
+            logger.error(f'❌ Ошибка при валидации входных данных: {e}')
+            yield {"errors": str(e)}
+            return
+
+        # одинаковые тексты отправляем в модель один раз
+        groups = self.group_duplicates(user_prompts_formatted)
+
+        if packed_system_prompt is not None:
+            units = self.plan_packs(user_prompts_formatted, list(groups))
+        else:
+            units = [[item_id] for item_id in groups]
+
+        def make_job(ids: List[int]):
+            if len(ids) == 1:
+                return partial(self.process_item_async, user_prompts_formatted[ids[0]], system_prompt, ids[0])
+            texts = {item_id: user_prompts_formatted[item_id] for item_id in ids}
+            return partial(self.process_pack_async, texts, packed_system_prompt)
 
+        semaphore = asyncio.Semaphore(max_concurrency)
 
+        async def run_limited(job) -> Dict[int, str]:
+            async with semaphore:
+                return await job()
 
+        def submit(batch_units: List[List[int]]) -> Dict[asyncio.Future, List[int]]:
+            jobs = [make_job(ids) for ids in batch_units]
+            if pool is not None:
+                futures = pool.submit_batch(jobs)
+            else:
+                futures = [asyncio.ensure_future(run_limited(job)) for job in jobs]
+            return dict(zip(futures, batch_units))
 
+        future_to_ids = submit(units)
 
+        # Отдаём результаты по мере готовности
+        pending = set(future_to_ids)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    ids = future_to_ids.pop(future)
+                    try:
+                        answers = future.result()
+                    except Exception as e:
+                        logger.error(f"❌ Ошибка при обработке item_id={ids if len(ids) > 1 else ids[0]}: {e}")
+                        answers = {} if len(ids) > 1 else {ids[0]: []}
+
+                    # отзывы пакета без валидного ответа - по одному
+                    missing = [item_id for item_id in ids if item_id not in answers]
+                    if missing:
+                        logger.warning(f"⚠️ Нет ответа в пакете для {len(missing)} из {len(ids)} отзывов, обрабатываем по одному")
+                        retry = submit([[item_id] for item_id in missing])
+                        future_to_ids.update(retry)
+                        pending |= set(retry)
+
+                    # раздаём ответ всем id с тем же текстом
+                    for item_id, answer in answers.items():
+                        for duplicate_id in groups[item_id]:
+                            yield {duplicate_id: answer}
+        finally:
+            # клиент отключился или запрос отменён - не оставляем задачи висеть
+            for future in pending:
+                future.cancel()
+
+    async def process_batch(
+            self,
+            system_prompt: str,
+            user_prompts: Union[Dict, str],
+            pool: Optional[LLMWorkerPool] = None,
+            max_concurrency: int = 4,
+            packed_system_prompt: Optional[str] = None
+    ) -> Dict:
+        """
+        Асинхронная параллельная обработка (см. iter_results).
+        Принимает и возвращает словари в том же формате, что и process_batch_threads.
+        """
+        results = [
+            result async for result in self.iter_results(
+                system_prompt, user_prompts, pool, max_concurrency, packed_system_prompt
+            )
+        ]
 
+        logger.debug('✅ Получены результаты обработки.')
+        sorted_results = sorted(results, key=lambda d: next(iter(d.keys())))
+        return self.formatter.format_output(sorted_results)
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Job = Tuple[Callable[[], Awaitable[Any]], asyncio.Future]
+
+
+class LLMWorkerPool:
+    """
+    Общий для всего процесса пул воркеров для запросов к LLM.
+
+    - не более max_concurrency запросов к модели одновременно, сколько бы
+      запросов /analyze ни пришло (лимит подбирается под квоту Yandex Cloud);
+    - честное планирование: воркеры берут задачи из батчей по очереди
+      (round-robin), поэтому большой батч не задерживает маленькие.
+
+    Живёт в app.state.llm_pool. Воркеры запускаются при первой задаче.
+    """
+
+    def __init__(self, max_concurrency: int = 8):
+        self.max_concurrency = max_concurrency
+        # очереди батчей, в которых есть задачи, в порядке обхода
+        self._ready: Deque[Deque[Job]] = deque()
+        self._pending: Optional[asyncio.Semaphore] = None
+        self._workers: List[asyncio.Task] = []
+        self.in_flight = 0
+
+    def _start(self) -> None:
+        """Запускает воркеры в текущем event loop."""
+        self._pending = asyncio.Semaphore(0)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"llm-worker-{i}")
+            for i in range(self.max_concurrency)
+        ]
+        logger.info(f"🚀 Запущен пул LLM воркеров: {self.max_concurrency}")
+
+    def submit_batch(self, jobs: List[Callable[[], Awaitable[Any]]]) -> List[asyncio.Future]:
+        """
+        Ставит задачи одного батча в очередь.
+        Возвращает future для каждой задачи в том же порядке.
+        Отменённые future (клиент ушёл) воркеры пропускают.
+        """
+        if not self._workers:
+            self._start()
+
+        loop = asyncio.get_running_loop()
+        queue: Deque[Job] = deque()
+        futures = []
+        for job in jobs:
+            future = loop.create_future()
+            queue.append((job, future))
+            futures.append(future)
+
+        if queue:
+            self._ready.append(queue)
+            for _ in queue:
+                self._pending.release()
+
+        return futures
+
+    def _next_job(self) -> Job:
+        """Берёт задачу из следующего по очереди батча."""
+        queue = self._ready.popleft()
+        job = queue.popleft()
+        if queue:
+            self._ready.append(queue)
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            await self._pending.acquire()
+            job, future = self._next_job()
+            if future.done():
+                continue
+
+            self.in_flight += 1
+            try:
+                result = await job()
+            except asyncio.CancelledError:
+                future.cancel()
+                # останавливаемся, только если отменили сам воркер (close),
+                # а не задачу внутри (например, вызов SDK)
+                if asyncio.current_task().cancelling():
+                    raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queued": sum(len(queue) for queue in self._ready),
+        }
+
+    async def close(self) -> None:
+        """Останавливает воркеры и отменяет задачи в очереди."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        while self._ready:
+            for _, future in self._ready.popleft():
+                future.cancel()
@@ -0,0 +1,81 @@
+"""
+Бенчмарк разбора тела /analyze: CPU на запрос до и после JsonFormatter.parse_input.
+
+- before: как было - FastAPI разбирает JSON (json.loads) и валидирует AnalyzeRequest,
+          затем format_input ещё раз валидирует всё через InputData;
+- after:  один проход orjson и одна проверка в {id: текст} (JsonFormatter.parse_input).
+
+Запуск (из api/):
+    python scripts/benchmark_input.py --reviews 10000 --repeat 20
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from processor.json_formatter import JsonFormatter  # noqa: E402
+from shemas.models import AnalyzeRequest  # noqa: E402
+
+PHRASES = [
+    "Оформил карту в приложении, доставили быстро.",
+    "Поддержка отвечала очень долго, вопрос так и не решили.",
+    "Кэшбэк начисляют вовремя, условия по вкладу хорошие.",
+    "В отделении большая очередь, банкомат не принимал купюры.",
+]
+
+
+def make_body(reviews: int, seed: int = 42) -> bytes:
+    rng = random.Random(seed)
+    data = [
+        {"id": i, "text": " ".join(rng.choices(PHRASES, k=rng.randint(1, 8)))}
+        for i in range(reviews)
+    ]
+    return json.dumps({"data": data}, ensure_ascii=False).encode("utf-8")
+
+
+def before(body: bytes) -> dict:
+    payload = json.loads(body)
+    AnalyzeRequest(**payload)
+    return JsonFormatter.format_input(payload)
+
+
+def after(body: bytes) -> dict:
+    return JsonFormatter.parse_input(body)
+
+
+def measure(fn, body: bytes, repeat: int) -> list:
+    fn(body)  # прогрев
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        fn(body)
+        timings.append((time.process_time() - start) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CPU на разбор тела /analyze")
+    parser.add_argument("--reviews", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for reviews in args.reviews:
+        body = make_body(reviews)
+        assert before(body) == after(body)
+
+        print(f"\n{reviews} отзывов, {len(body) / 1024 / 1024:.1f} MB")
+        results = {}
+        for name, fn in (("before", before), ("after", after)):
+            timings = measure(fn, body, args.repeat)
+            results[name] = statistics.median(timings)
+            print(f"  {name:<7} median {results[name]:7.1f} ms CPU, max {max(timings):7.1f} ms")
+        print(f"  ускорение: x{results['before'] / results['after']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
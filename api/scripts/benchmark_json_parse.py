@@ -0,0 +1,104 @@
+"""
+Бенчмарк разбора ответов LLM: прежний parse_model_response (три regex + json.loads)
+против utils.json_extract.extract_json.
+
+Считает CPU на ответ и число ответов, которые не удалось разобрать (в API это
+предупреждения "Ошибка парсинга LLM" и пустые предсказания).
+
+По умолчанию корпус строится из типичных форм ответов модели на TOPICS_SENTIMENTS_PROMPT
+(чистый JSON, ```json ограждения, текст до/после JSON, оборванный ответ и т.п.).
+Свои ответы модели - JSONL файл, по строке-JSON-строке на ответ:
+    python scripts/benchmark_json_parse.py --corpus answers.jsonl
+
+Запуск (из api/):
+    python scripts/benchmark_json_parse.py --responses 20000
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.json_extract import extract_json  # noqa: E402
+
+TOPICS = ["Карты", "Кредиты", "Вклады", "Мобильное приложение", "Обслуживание", "Кэшбэк"]
+SENTIMENTS = ["положительно", "отрицательно", "нейтрально"]
+
+
+def legacy_parse(text: str):
+    """parse_model_response до перехода на extract_json."""
+    text = text.strip()
+    text = re.sub(r'^\s*```?json\s*', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'```?\s*$', '', text)
+    match = re.search(r'[\{\[].*[\}\]]', text, re.DOTALL)
+    if not match:
+        raise ValueError("JSON не найден в ответе")
+    try:
+        return json.loads(match.group())
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Не удалось распарсить JSON: {e}")
+
+
+def make_answer(rng: random.Random) -> str:
+    n = rng.randint(1, 3)
+    payload = json.dumps({"predictions": {
+        "topics": rng.sample(TOPICS, n),
+        "sentiments": [rng.choice(SENTIMENTS) for _ in range(n)],
+    }}, ensure_ascii=False, indent=rng.choice([None, 2]))
+
+    shape = rng.random()
+    if shape < 0.35:
+        return payload
+    if shape < 0.75:
+        return f"```json\n{payload}\n```"
+    if shape < 0.83:
+        return f"Вот результат анализа:\n```json\n{payload}\n```\nЕсли нужно, уточню."
+    if shape < 0.88:
+        return f"{payload}\nПримечание: в отзыве {{упоминается}} несколько продуктов."
+    if shape < 0.93:
+        return f"Ответ {{кратко}}: {payload}"
+    # оборванный ответ (лимит токенов, обрыв соединения)
+    return f"```json\n{payload[:rng.randint(len(payload) // 2, len(payload) - 1)]}"
+
+
+def load_corpus(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def run(parse, corpus: list) -> tuple:
+    failures = 0
+    start = time.process_time()
+    for text in corpus:
+        try:
+            parse(text)
+        except ValueError:
+            failures += 1
+    elapsed = time.process_time() - start
+    return elapsed / len(corpus) * 1e6, failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CPU и ошибки разбора ответов LLM")
+    parser.add_argument("--responses", type=int, default=20000)
+    parser.add_argument("--corpus", help="JSONL с ответами модели (строка JSON на ответ)")
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = load_corpus(args.corpus)
+    else:
+        rng = random.Random(42)
+        corpus = [make_answer(rng) for _ in range(args.responses)]
+
+    print(f"Ответов: {len(corpus)}")
+    for name, parse in (("regex (прежний)", legacy_parse), ("extract_json", extract_json)):
+        per_item, failures = run(parse, corpus)
+        print(f"  {name:<16} {per_item:6.1f} мкс CPU на ответ, не разобрано: {failures} ({failures / len(corpus):.1%})")
+
+
+if __name__ == "__main__":
+    main()
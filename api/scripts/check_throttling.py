@@ -0,0 +1,151 @@
+"""
+Проверка LLMThrottle на локальной фейковой модели (ya_cloud_llm.fake_llm), без сети.
+
+Фейковый сервис пропускает capacity одновременных запросов, сверх - 429 / RESOURCE_EXHAUSTED,
+и с вероятностью error_rate отвечает 503 / UNAVAILABLE. Скрипт прогоняет через него
+process_batch_threads (потоки) и iter_results (event loop, общий пул) и проверяет:
+
+- лимит одновременных запросов (stats()["concurrency_limit"]) снижается под 429/5xx
+  и возвращается к максимуму, когда сервис перестаёт отказывать;
+- пока хватает попыток, ни один отзыв не теряется (failures == 0, нет пустых предсказаний);
+- после max_attempts попыток ошибка уходит вызывающему;
+- волна ошибок в пределах cooldown снижает лимит один раз.
+
+Запуск (из api/):
+    python scripts/check_throttling.py
+"""
+import asyncio
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from processor.review_processor import YaReviewProcessor  # noqa: E402
+from processor.worker_pool import LLMWorkerPool  # noqa: E402
+from ya_cloud_llm.fake_llm import AsyncFakeLLM, FakeLLMError, FakeLLMServer, SyncFakeLLM  # noqa: E402
+from ya_cloud_llm.throttling import LLMThrottle  # noqa: E402
+
+SYSTEM_PROMPT = "Определи темы и тональности отзыва"
+MAX_CONCURRENCY = 8
+
+
+def make_throttle(**kwargs) -> LLMThrottle:
+    options = dict(rps=1000, max_concurrency=MAX_CONCURRENCY, max_attempts=10,
+                   base_delay=0.02, max_delay=0.5, cooldown=0.1)
+    options.update(kwargs)
+    return LLMThrottle(**options)
+
+
+def make_processor(server: FakeLLMServer, throttle: LLMThrottle) -> YaReviewProcessor:
+    return YaReviewProcessor(
+        throttle=throttle,
+        model=SyncFakeLLM(server, throttle=throttle),
+        async_model=AsyncFakeLLM(server, throttle=throttle)
+    )
+
+
+def make_reviews(count: int, prefix: str) -> dict:
+    return {"data": [{"id": i, "text": f"{prefix} отзыв {i}"} for i in range(count)]}
+
+
+class LimitWatcher:
+    """Фоновый поток: минимальный concurrency_limit за время прогона."""
+
+    def __init__(self, throttle: LLMThrottle):
+        self.throttle = throttle
+        self.lowest = throttle.stats()["concurrency_limit"]
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(0.002):
+            self.lowest = min(self.lowest, self.throttle.stats()["concurrency_limit"])
+
+    def __enter__(self) -> "LimitWatcher":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def run_threads(processor: YaReviewProcessor, reviews: dict) -> list:
+    result = processor.process_batch_threads(SYSTEM_PROMPT, reviews, max_workers=MAX_CONCURRENCY)
+    return result["predictions"]
+
+
+def run_async(processor: YaReviewProcessor, reviews: dict) -> list:
+    async def collect() -> list:
+        pool = LLMWorkerPool(max_concurrency=MAX_CONCURRENCY)
+        try:
+            results = [item async for item in processor.iter_results(SYSTEM_PROMPT, reviews, pool=pool)]
+        finally:
+            await pool.close()
+        return processor.formatter.format_output(results)["predictions"]
+
+    return asyncio.run(collect())
+
+
+def check_overload_and_recovery(name: str, run) -> None:
+    server = FakeLLMServer(capacity=3, latency=0.02, error_rate=0.05, seed=42)
+    throttle = make_throttle()
+    processor = make_processor(server, throttle)
+
+    # сервис перегружен: 429 сверх трёх одновременных запросов и 5% временных сбоев
+    start = time.perf_counter()
+    with LimitWatcher(throttle) as watcher:
+        predictions = run(processor, make_reviews(80, name))
+    stats = throttle.stats()
+    print(f"{name}: перегрузка  {time.perf_counter() - start:5.2f} с, "
+          f"минимальный лимит {watcher.lowest}, throttle {stats}, сервис {server.stats()}")
+    assert server.throttled > 0 and server.errors > 0, "фейковый сервис не отказывал"
+    assert watcher.lowest < MAX_CONCURRENCY, "лимит не снизился под 429/5xx"
+    assert stats["retries"] > 0
+    assert stats["failures"] == 0, "отзывы потеряны, хотя попыток хватало"
+    assert len(predictions) == 80 and all(p["topics"] for p in predictions), "пустые предсказания"
+
+    # сервис восстановился: лимит растёт обратно до максимума
+    server.capacity = 100
+    server.error_rate = 0.0
+    start = time.perf_counter()
+    predictions = run(processor, make_reviews(200, f"{name} после"))
+    stats = throttle.stats()
+    print(f"{name}: восстановление {time.perf_counter() - start:5.2f} с, throttle {stats}")
+    assert stats["concurrency_limit"] == MAX_CONCURRENCY, "лимит не вернулся к максимуму"
+    assert stats["failures"] == 0
+    assert all(p["topics"] for p in predictions)
+
+
+def check_give_up() -> None:
+    for capacity, error_rate, code in ((0, 0.0, 429), (100, 1.0, 503)):
+        server = FakeLLMServer(capacity=capacity, latency=0.0, error_rate=error_rate)
+        # большой cooldown: все отказы - одна волна, лимит снижается один раз
+        throttle = make_throttle(max_attempts=3, base_delay=0.001, cooldown=60)
+        model = AsyncFakeLLM(server, throttle=throttle)
+        try:
+            asyncio.run(model.process_item("отзыв", SYSTEM_PROMPT))
+        except FakeLLMError as e:
+            assert e.status_code == code
+        else:
+            raise AssertionError("ошибка не дошла до вызывающего")
+        stats = throttle.stats()
+        print(f"отказ {code}: вызовов {server.calls}, throttle {stats}")
+        assert server.calls == 3
+        assert stats["retries"] == 2 and stats["failures"] == 1
+        assert stats["concurrency_limit"] == MAX_CONCURRENCY // 2
+
+
+def main() -> None:
+    random.seed(42)  # jitter повторов
+    check_overload_and_recovery("потоки", run_threads)
+    check_overload_and_recovery("async", run_async)
+    check_give_up()
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
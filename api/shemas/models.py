@@ -15,6 +15,10 @@ class InputData(BaseModel):
     data: List[InputItem] = Field(..., min_length=1)
 
 
+class ReviewTexts(dict):
+    """Проверенный вход {id: текст} (JsonFormatter.parse_input), повторно не валидируется."""
+
+
 class Prediction(BaseModel):
     model_config = ConfigDict(coerce_numbers_to_str=False)
 
@@ -26,4 +30,21 @@ class Prediction(BaseModel):
 class OutputData(BaseModel):
     predictions: List[Prediction] = Field(default_factory=list)
     warnings: Optional[str] = None
-    timestamp: Optional[str] = None
\ No newline at end of file
+    timestamp: Optional[str] = None
+
+class JobInfo(BaseModel):
+    job_id: str
+    status: str = Field(..., description="queued | running | completed | failed")
+    total: int
+    processed: int = 0
+    warnings: int = 0
+    error: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+
+class JobResults(BaseModel):
+    job_id: str
+    predictions: List[Prediction] = Field(default_factory=list)
+    next_cursor: int = Field(..., description="Курсор для следующей страницы")
+    complete: bool = Field(..., description="Задача завершена и все результаты выданы")
@@ -0,0 +1,133 @@
+"""
+Извлечение JSON из ответа LLM.
+
+Общий для API (utils.json_utils.parse_model_response) и local_classificator.
+Зависит только от orjson (если не установлен - стандартный json).
+"""
+import re
+from typing import Any, List, Optional, Tuple
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _DecodeError = orjson.JSONDecodeError
+except ImportError:  # local_classificator может работать без orjson
+    import json
+
+    _loads = json.loads
+    _DecodeError = json.JSONDecodeError
+
+# Символы, важные для разбора структуры; всё остальное пропускается без цикла на Python
+_STRUCTURE = re.compile(r'[{}\[\]",\\]')
+# Начало JSON: объект начинается с ключа или пуст, скобки в тексте ({кратко}) пропускаются
+_OPEN = re.compile(r'\{\s*["}]|\[')
+_CLOSING = {"{": "}", "[": "]"}
+
+
+def extract_json(text: str, repair: bool = True) -> Any:
+    """
+    Возвращает JSON из ответа модели.
+
+    1. Срез от первой открывающей до последней закрывающей скобки - один вызов orjson.loads
+       (чистый JSON, ```json ограждения и текст вокруг одного JSON).
+    2. Иначе один линейный проход с подсчётом скобок (с учётом строк и экранирования):
+       берётся первый сбалансированный объект/массив, поэтому текст после JSON
+       и скобки в тексте до него не мешают.
+    3. Ответ оборвался (не хватает закрывающих скобок) - JSON достраивается:
+       дописываются закрывающие скобки, оборванное значение отбрасывается.
+       С repair=False оборванный ответ считается ошибкой.
+
+    ValueError - если JSON не найден или не разбирается.
+    """
+    start = _find_open(text, 0)
+    if start is None:
+        raise ValueError("JSON не найден в ответе")
+
+    end = max(text.rfind("}"), text.rfind("]")) + 1
+    if end > start:
+        try:
+            return _loads(text[start:end])
+        except _DecodeError:
+            pass
+
+    last_error = None
+    while start is not None:
+        end, truncated = _scan(text, start)
+        if truncated is None:
+            try:
+                return _loads(text[start:end])
+            except _DecodeError as e:
+                # скобки в тексте до JSON - ищем следующий кандидат
+                last_error = e
+                start = _find_open(text, start + 1)
+                continue
+
+        if not repair:
+            raise ValueError("Ответ модели оборван: JSON не закрыт")
+        for candidate in truncated:
+            try:
+                return _loads(candidate)
+            except _DecodeError as e:
+                last_error = e
+        break
+
+    raise ValueError(f"Не удалось распарсить JSON: {last_error}")
+
+
+def _find_open(text: str, position: int) -> Optional[int]:
+    """Позиция первого возможного начала JSON ('{"', '{}' или '[') начиная с position."""
+    match = _OPEN.search(text, position)
+    return match.start() if match else None
+
+
+def _scan(text: str, start: int) -> Tuple[int, Optional[List[str]]]:
+    """
+    Проходит от открывающей скобки в позиции start.
+    Возвращает (конец сбалансированного JSON, None) или, если текст кончился раньше,
+    (len(text), варианты достроенного JSON в порядке предпочтения).
+    """
+    stack = [text[start]]
+    in_string = False
+    escaped = -1
+    # последнее место, где можно оборвать JSON без потери целых значений: (позиция, стек)
+    cut: Tuple[int, List[str]] = (start + 1, list(stack))
+
+    for match in _STRUCTURE.finditer(text, start + 1):
+        index = match.start()
+        if index == escaped:
+            continue
+        char = match.group()
+
+        if in_string:
+            if char == "\\":
+                escaped = index + 1
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(char)
+            cut = (index + 1, list(stack))
+        elif char in "}]":
+            stack.pop()
+            if not stack:
+                return index + 1, None
+        elif char == ",":
+            cut = (index, list(stack))
+
+    # текст кончился внутри JSON: сначала пробуем просто закрыть скобки,
+    # затем - отбросить оборванное значение
+    candidates = []
+    if not in_string:
+        tail = text[start:].rstrip()
+        candidates.append(tail + _closers(stack))
+    position, cut_stack = cut
+    candidates.append(text[start:position] + _closers(cut_stack))
+    return len(text), candidates
+
+
+def _closers(stack: List[str]) -> str:
+    return "".join(_CLOSING[char] for char in reversed(stack))
@@ -1,36 +1,19 @@
 import json
-import re
 import pandas as pd
 from typing import Optional, Dict, Any
 import random
 
+from utils.json_extract import extract_json
 
 
-def parse_model_response(text: str) -> Dict[str, Any]:
+
+def parse_model_response(text: str, repair: bool = True) -> Dict[str, Any]:
     """
-    Парсит ответ модели, убирая префиксы вроде 'json', тройные кавычки и пробелы.
+    Парсит ответ модели: ```json ограждения, текст вокруг JSON,
+    оборванный JSON (при repair=True) - см. utils.json_extract.extract_json.
     Возвращает словарь.
     """
-    # Убираем пробелы по краям
-    text = text.strip()
-
-    # Удаляем префикс "json" (регистронезависимо), если он в начале
-    text = re.sub(r'^\s*```?json\s*', '', text, flags=re.IGNORECASE)
-
-    # Удаляем закрывающую тройную кавычку, если есть
-    text = re.sub(r'```?\s*$', '', text)
-
-    # Ищем первую подстроку, похожую на JSON (начинается с '{' или '[')
-    match = re.search(r'[\{\[].*[\}\]]', text, re.DOTALL)
-    if not match:
-        raise ValueError("JSON не найден в ответе")
-
-    json_str = match.group()
-
-    try:
-        return json.loads(json_str)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Не удалось распарсить JSON: {e}")
+    return extract_json(text, repair=repair)
 
 
 def load_reviews_to_json(
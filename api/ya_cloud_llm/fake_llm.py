@@ -0,0 +1,143 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Optional
+
+from ya_cloud_llm.throttling import LLMThrottle
+from ya_cloud_llm.ycloud_llm import LLMBackend
+
+# Ответ фейковой модели на один отзыв (формат TOPICS_SENTIMENTS_PROMPT)
+FAKE_PREDICTION = {"topics": ["Обслуживание"], "sentiments": ["нейтрально"]}
+
+
+class FakeGrpcCode:
+    """Код ответа как у gRPC ошибок SDK (classify_error читает code().name)."""
+    def __init__(self, name: str):
+        self.name = name
+
+
+class FakeLLMError(Exception):
+    """
+    Ошибка фейкового сервиса: status_code как у HTTP ответа и code() как у gRPC ошибки SDK.
+    """
+    def __init__(self, status_code: int, grpc_code: str):
+        super().__init__(f"{status_code} {grpc_code}")
+        self.status_code = status_code
+        self.grpc_code = grpc_code
+
+    def code(self) -> FakeGrpcCode:
+        return FakeGrpcCode(self.grpc_code)
+
+
+class FakeLLMServer:
+    """
+    Локальная имитация квоты Yandex Cloud для проверки LLMThrottle без сети.
+
+    - больше capacity одновременных запросов - 429 / RESOURCE_EXHAUSTED;
+    - с вероятностью error_rate - временный сбой 503 / UNAVAILABLE;
+    - иначе ответ через latency секунд.
+    Один сервер делят синхронная и асинхронная фейковые модели. Потокобезопасен.
+    """
+
+    def __init__(self, capacity: int = 3, latency: float = 0.05, error_rate: float = 0.0, seed: Optional[int] = None):
+        self.capacity = capacity
+        self.latency = latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+        self.throttled = 0
+        self.errors = 0
+
+    def enter(self) -> None:
+        with self._lock:
+            self.calls += 1
+            if self.active >= self.capacity:
+                self.throttled += 1
+                raise FakeLLMError(429, "RESOURCE_EXHAUSTED")
+            if self._random.random() < self.error_rate:
+                self.errors += 1
+                raise FakeLLMError(503, "UNAVAILABLE")
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def leave(self) -> None:
+        with self._lock:
+            self.active -= 1
+
+    @staticmethod
+    def answer(user_prompt: str) -> str:
+        """Ответ на одиночный отзыв или на пакет (JSON список {"id", "text"})."""
+        try:
+            pack = json.loads(user_prompt)
+        except ValueError:
+            pack = None
+        if isinstance(pack, list):
+            predictions = {str(item["id"]): FAKE_PREDICTION for item in pack}
+        else:
+            predictions = FAKE_PREDICTION
+        return "```json\n" + json.dumps({"predictions": predictions}, ensure_ascii=False) + "\n```"
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "peak": self.peak,
+            "calls": self.calls,
+            "throttled": self.throttled,
+            "errors": self.errors,
+        }
+
+
+class SyncFakeLLM(LLMBackend):
+    """
+    Фейковая модель поверх FakeLLMServer, синхронный вариант (process_batch_threads).
+    """
+    def __init__(self, server: FakeLLMServer, temperature: float = 0.3, throttle: Optional[LLMThrottle] = None):
+        super().__init__("fake://llm", temperature, throttle)
+        self.server = server
+
+    def process_item(self, user_prompt: str, system_prompt: str) -> str:
+        if self.throttle is None:
+            return self._run(user_prompt, system_prompt)
+        return self.throttle.call(
+            lambda: self._run(user_prompt, system_prompt),
+            tokens=self.request_tokens(user_prompt, system_prompt)
+        )
+
+    def _run(self, user_prompt: str, system_prompt: str) -> str:
+        self.server.enter()
+        try:
+            time.sleep(self.server.latency)
+            return self.server.answer(user_prompt)
+        finally:
+            self.server.leave()
+
+
+class AsyncFakeLLM(LLMBackend):
+    """
+    Фейковая модель поверх FakeLLMServer, асинхронный вариант.
+    """
+    def __init__(self, server: FakeLLMServer, temperature: float = 0.3, throttle: Optional[LLMThrottle] = None):
+        super().__init__("fake://llm", temperature, throttle)
+        self.server = server
+
+    async def process_item(self, user_prompt: str, system_prompt: str) -> str:
+        if self.throttle is None:
+            return await self._run(user_prompt, system_prompt)
+        return await self.throttle.call_async(
+            lambda: self._run(user_prompt, system_prompt),
+            tokens=self.request_tokens(user_prompt, system_prompt)
+        )
+
+    async def _run(self, user_prompt: str, system_prompt: str) -> str:
+        self.server.enter()
+        try:
+            await asyncio.sleep(self.server.latency)
+            return self.server.answer(user_prompt)
+        finally:
+            self.server.leave()
@@ -0,0 +1,257 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Грубая оценка числа токенов для русского текста (символов на токен)
+CHARS_PER_TOKEN = 3
+
+# gRPC коды ответов Yandex Cloud: квота исчерпана и временные сбои на стороне сервиса
+THROTTLE_GRPC_CODES = {"RESOURCE_EXHAUSTED"}
+TRANSIENT_GRPC_CODES = {"UNAVAILABLE", "INTERNAL", "DEADLINE_EXCEEDED", "ABORTED"}
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def classify_error(error: BaseException) -> Tuple[bool, bool]:
+    """
+    Возвращает (можно ли повторить запрос, это ограничение квоты).
+    Понимает gRPC ошибки SDK (error.code()) и HTTP-подобные (error.status_code: 429, 5xx).
+    """
+    code = getattr(error, "code", None)
+    if callable(code):
+        try:
+            name = getattr(code(), "name", str(code()))
+        except Exception:
+            name = None
+        if name in THROTTLE_GRPC_CODES:
+            return True, True
+        if name in TRANSIENT_GRPC_CODES:
+            return True, False
+
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        if status == 429:
+            return True, True
+        if status >= 500:
+            return True, False
+
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True, False
+
+    return False, False
+
+
+class TokenBucket:
+    """
+    Token bucket: rate единиц в секунду, запас не больше capacity.
+    reserve() сразу списывает единицы (баланс может уйти в минус) и возвращает,
+    сколько секунд подождать, - так очередь ожидающих не обгоняет друг друга.
+    Потокобезопасен, одинаково работает из потоков и из event loop.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # запрос больше всего запаса пропускаем, иначе он не пройдёт никогда
+            self._tokens -= min(amount, self.capacity)
+            return max(0.0, -self._tokens / self.rate)
+
+
+class LLMThrottle:
+    """
+    Ограничение и повторы запросов к LLM под квоту Yandex Cloud.
+
+    - token bucket по запросам в секунду (rps) и токенам в минуту (tpm);
+    - AIMD лимит одновременных запросов: +1 за "окно" успешных ответов,
+      в два раза меньше при 429/5xx и других временных сбоях сервиса
+      (не чаще раза в cooldown секунд);
+    - повтор временных ошибок с экспоненциальной задержкой и полным jitter,
+      до max_attempts попыток; после этого ошибка уходит вызывающему.
+
+    Один экземпляр делят синхронная и асинхронная модели процессора.
+    """
+
+    def __init__(
+            self,
+            rps: float = 10.0,
+            tpm: Optional[float] = None,
+            max_concurrency: int = 8,
+            min_concurrency: int = 1,
+            max_attempts: int = 4,
+            base_delay: float = 0.5,
+            max_delay: float = 10.0,
+            cooldown: float = 1.0
+    ):
+        self.requests = TokenBucket(rps)
+        self.tokens = TokenBucket(tpm / 60.0, tpm) if tpm else None
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.cooldown = cooldown
+
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._async_waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+        self.retries = 0
+        self.throttled = 0
+        self.failures = 0
+
+    # --- AIMD лимит одновременных запросов ---
+
+    def _try_enter(self) -> bool:
+        if self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return True
+        return False
+
+    def _wake(self) -> None:
+        """Отдаёт освободившиеся места ожидающим (под self._cond)."""
+        self._cond.notify_all()
+        while self._async_waiters and self.in_flight < int(self.limit):
+            loop, future = self._async_waiters.popleft()
+            if future.cancelled():
+                continue
+            self.in_flight += 1
+            loop.call_soon_threadsafe(self._grant, future)
+
+    def _grant(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+
+    def acquire(self) -> None:
+        with self._cond:
+            while not self._try_enter():
+                self._cond.wait()
+
+    async def acquire_async(self) -> None:
+        with self._cond:
+            if self._try_enter():
+                return
+            future = asyncio.get_running_loop().create_future()
+            self._async_waiters.append((asyncio.get_running_loop(), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # место уже выдано, но задача отменена - возвращаем
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._wake()
+
+    def on_success(self) -> None:
+        with self._cond:
+            if self.limit < self.max_concurrency:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+                self._wake()
+
+    def on_throttle(self, quota: bool = True) -> None:
+        """Сервис перегружен: quota=True - 429 (квота), False - 5xx/таймаут."""
+        with self._cond:
+            if quota:
+                self.throttled += 1
+            now = time.monotonic()
+            # одна волна ошибок от одновременных запросов - одно снижение
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.limit = max(float(self.min_concurrency), self.limit / 2)
+            reason = "Ограничение квоты LLM" if quota else "Сбой LLM"
+            logger.warning(f"⚠️ {reason}, лимит одновременных запросов: {int(self.limit)}")
+
+    # --- повторы ---
+
+    def _before_attempt(self, tokens: int) -> float:
+        """Сколько ждать перед запросом по rps и tpm."""
+        delay = self.requests.reserve(1)
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.reserve(tokens))
+        return delay
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        retryable, throttled = classify_error(error)
+        if retryable:
+            self.on_throttle(quota=throttled)
+        if not retryable or attempt + 1 >= self.max_attempts:
+            self.failures += 1
+            return False
+        self.retries += 1
+        logger.warning(f"⚠️ Ошибка LLM (попытка {attempt + 1}/{self.max_attempts}), повторяем: {error}")
+        return True
+
+    def call(self, fn: Callable[[], Any], tokens: int = 0) -> Any:
+        """Синхронный вызов fn() с лимитами и повторами."""
+        attempt = 0
+        while True:
+            time.sleep(self._before_attempt(tokens))
+            self.acquire()
+            try:
+                result = fn()
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+            else:
+                self.on_success()
+                return result
+            finally:
+                self.release()
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+
+    async def call_async(self, fn: Callable[[], Awaitable[Any]], tokens: int = 0) -> Any:
+        """Асинхронный вызов await fn() с лимитами и повторами."""
+        attempt = 0
+        while True:
+            await asyncio.sleep(self._before_attempt(tokens))
+            await self.acquire_async()
+            try:
+                result = await fn()
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+            else:
+                self.on_success()
+                return result
+            finally:
+                self.release()
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def stats(self) -> dict:
+        return {
+            "concurrency_limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "failures": self.failures,
+        }
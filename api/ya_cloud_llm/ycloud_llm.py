@@ -1,22 +1,53 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 
-from yandex_cloud_ml_sdk import YCloudML
+from yandex_cloud_ml_sdk import AsyncYCloudML, YCloudML
 
+from ya_cloud_llm.throttling import LLMThrottle, estimate_tokens
 
-class YCloudLLM(ABC):
+# Оценка длины ответа модели в токенах для лимита TPM (короткий JSON)
+ANSWER_TOKENS = 100
+
+
+class LLMBackend(ABC):
+    """
+    Общий интерфейс LLM бэкенда для YaReviewProcessor (Yandex Cloud, локальная GGUF модель).
+    process_item(user_prompt, system_prompt) возвращает сырой текст ответа
+    (у асинхронных реализаций - корутина).
+    model_uri и temperature входят в ключ кэша классификаций.
+    """
+    def __init__(self, model_uri: str, temperature: float = 0.3, throttle: Optional[LLMThrottle] = None):
+        self.model_uri = model_uri
+        self.temperature = temperature
+        # лимиты квоты и повторы (None - запрос уходит сразу, без повторов)
+        self.throttle = throttle
+
+    @staticmethod
+    def request_tokens(user_prompt: str, system_prompt: str) -> int:
+        return estimate_tokens(system_prompt) + estimate_tokens(user_prompt) + ANSWER_TOKENS
+
+    @abstractmethod
+    def process_item(self, user_prompt: str, system_prompt: str) -> str:
+        raise NotImplementedError()
+
+
+class YCloudLLM(LLMBackend):
     """
     Абстрактный класс для обработки запросов к Yandex Cloud Foundation Models.
     Позволяет легко менять реализацию (sync/async).
     """
-    def __init__(self, folder_id: str, api_key: str, model_name: str = "yandexgpt-lite"):
+    def __init__(
+            self,
+            folder_id: str,
+            api_key: str,
+            model_name: str = "yandexgpt-lite",
+            temperature: float = 0.3,
+            throttle: Optional[LLMThrottle] = None
+    ):
+        super().__init__(f"gpt://{folder_id}/{model_name}/latest", temperature, throttle)
         self.folder_id = folder_id
         self.api_key = api_key
         self.model_name = model_name
-        self.model_uri = f"gpt://{folder_id}/{model_name}/latest"
-
-    @abstractmethod
-    def process_item(self, user_prompt: str, system_prompt: str) -> str:
-        raise NotImplementedError()
 
 
 
@@ -24,23 +55,75 @@ class SyncYCloudLLM(YCloudLLM):
     """
     Реализация для синхронного использования.
     """
-    def __init__(self, folder_id: str, api_key: str, model_name: str = "yandexgpt-lite"):
-        super().__init__(folder_id, api_key, model_name)
+    def __init__(
+            self,
+            folder_id: str,
+            api_key: str,
+            model_name: str = "yandexgpt-lite",
+            temperature: float = 0.3,
+            throttle: Optional[LLMThrottle] = None
+    ):
+        super().__init__(folder_id, api_key, model_name, temperature, throttle)
         self.sdk = YCloudML(folder_id=folder_id, auth=api_key)
-        self.model = self.sdk.models.completions(self.model_uri).configure(temperature=0.3, max_tokens=2000)
+        self.model = self.sdk.models.completions(self.model_uri).configure(temperature=self.temperature, max_tokens=2000)
 
     def process_item(self, user_prompt: str, system_prompt: str) -> str:
         """
         Возвращает сырой текст от LLM.
-        При ошибке — пробрасывает исключение наверх.
+        С throttle - с учётом лимитов квоты и повторами временных ошибок (429/5xx).
+        При ошибке (после всех попыток) — пробрасывает исключение наверх.
+        """
+        if self.throttle is None:
+            return self._run(user_prompt, system_prompt)
+        return self.throttle.call(
+            lambda: self._run(user_prompt, system_prompt),
+            tokens=self.request_tokens(user_prompt, system_prompt)
+        )
+
+    def _run(self, user_prompt: str, system_prompt: str) -> str:
+        result = self.model.run([
+            {"role": "system", "text": system_prompt},
+            {"role": "user", "text": user_prompt}
+        ])
+
+        return result[0].text.strip()
+
+
+class AsyncYCloudLLM(YCloudLLM):
+    """
+    Реализация для асинхронного использования.
+    Запросы к модели не блокируют event loop, поэтому на одном воркере
+    одновременно может выполняться много запросов.
+    """
+    def __init__(
+            self,
+            folder_id: str,
+            api_key: str,
+            model_name: str = "yandexgpt-lite",
+            temperature: float = 0.3,
+            throttle: Optional[LLMThrottle] = None
+    ):
+        super().__init__(folder_id, api_key, model_name, temperature, throttle)
+        self.sdk = AsyncYCloudML(folder_id=folder_id, auth=api_key)
+        self.model = self.sdk.models.completions(self.model_uri).configure(temperature=self.temperature, max_tokens=2000)
+
+    async def process_item(self, user_prompt: str, system_prompt: str) -> str:
+        """
+        Возвращает сырой текст от LLM.
+        С throttle - с учётом лимитов квоты и повторами временных ошибок (429/5xx).
+        При ошибке (после всех попыток) — пробрасывает исключение наверх.
         """
-        try:
-            result = self.model.run([
-                {"role": "system", "text": system_prompt},
-                {"role": "user", "text": user_prompt}
-            ])
+        if self.throttle is None:
+            return await self._run(user_prompt, system_prompt)
+        return await self.throttle.call_async(
+            lambda: self._run(user_prompt, system_prompt),
+            tokens=self.request_tokens(user_prompt, system_prompt)
+        )
 
-            return result[0].text.strip()
+    async def _run(self, user_prompt: str, system_prompt: str) -> str:
+        result = await self.model.run([
+            {"role": "system", "text": system_prompt},
+            {"role": "user", "text": user_prompt}
+        ])
 
-        except Exception as e:
-            raise
+        return result[0].text.strip()
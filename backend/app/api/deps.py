@@ -4,7 +4,8 @@ from typing import AsyncGenerator
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import async_session_factory
+from app.core.config import settings
+from app.db.session import async_session_factory, read_fanout, read_session_factory
 from app.repositories.config_repository import ConfigRepository
 from app.repositories.dashboard_repository import DashboardRepository
 from app.services.config_service import ConfigService
@@ -27,6 +28,23 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting read-only database session.
+
+    Yields:
+        AsyncSession bound to the reader engine (query_only connections)
+
+    Note:
+        Use for dashboard reads so they do not compete with writes for
+        writer pool connections.
+    """
+    async with read_session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
 async def get_config_repository(
     db: AsyncSession = Depends(get_db),
 ) -> ConfigRepository:
@@ -66,30 +84,34 @@ async def get_config_service(
 
 
 async def get_dashboard_repository(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> DashboardRepository:
     """Dependency for getting DashboardRepository instance.
 
     Args:
-        db: Database session (injected by FastAPI via Depends)
+        db: Read-only database session (injected by FastAPI via Depends)
 
     Returns:
         DashboardRepository instance
 
     Note:
         This is a factory function that creates a new repository instance
-        for each request with the database session from get_db.
+        for each request with the database session from get_read_db.
     """
-    return DashboardRepository(db)
+    return DashboardRepository(
+        db,
+        use_rollup=settings.DASHBOARD_USE_ROLLUP,
+        fanout=read_fanout if settings.DB_FANOUT_CONCURRENCY > 0 else None,
+    )
 
 
 async def get_dashboard_service(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> DashboardService:
     """Dependency for getting DashboardService instance.
 
     Args:
-        db: Database session (injected by FastAPI via Depends)
+        db: Read-only database session (injected by FastAPI via Depends)
 
     Returns:
         DashboardService instance
@@ -99,5 +121,9 @@ async def get_dashboard_service(
         for each request. The repository is automatically created with the
         provided database session.
     """
-    repository = DashboardRepository(db)
+    repository = DashboardRepository(
+        db,
+        use_rollup=settings.DASHBOARD_USE_ROLLUP,
+        fanout=read_fanout if settings.DB_FANOUT_CONCURRENCY > 0 else None,
+    )
     return DashboardService(repository)
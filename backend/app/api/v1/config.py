@@ -1,15 +1,41 @@
 """API router for configuration endpoints."""
 
-from fastapi import APIRouter, Depends
+import hashlib
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_config_service
+from app.core.cache import config_cache
 from app.schemas.config import ConfigResponse
 from app.services.config_service import ConfigService
 
 router = APIRouter()
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check If-None-Match header against current ETag.
+
+    Args:
+        if_none_match: Raw If-None-Match header value (may list several tags)
+        etag: Current strong ETag (quoted)
+
+    Returns:
+        True if the client copy is current
+
+    Note:
+        Uses weak comparison (W/ prefix ignored), as required for
+        If-None-Match.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in tags)
+
+
 @router.get(
     "/config",
     response_model=ConfigResponse,
@@ -23,6 +49,8 @@ router = APIRouter()
     - **Date presets**: Predefined date range options
 
     This endpoint is typically called once on application load and cached.
+    The response is cached on the server for CACHE_TTL_CONFIG seconds and
+    carries a strong ETag; send it back in If-None-Match to get 304.
     """,
     responses={
         200: {
@@ -54,6 +82,9 @@ router = APIRouter()
                 }
             },
         },
+        304: {
+            "description": "Configuration not modified since the given ETag",
+        },
         500: {
             "description": "Internal server error",
         },
@@ -63,15 +94,32 @@ router = APIRouter()
 async def get_config(
     db: AsyncSession = Depends(get_db),
     service: ConfigService = Depends(get_config_service),
+    if_none_match: Optional[str] = Header(default=None),
 ) -> ConfigResponse:
     """Get configuration data for frontend.
 
     Args:
         db: Database session (injected)
         service: ConfigService instance (injected)
+        if_none_match: If-None-Match header (optional)
 
     Returns:
         ConfigResponse with sources, products, and date presets
+        (serialized, with ETag), or empty 304 response
+
+    Note:
+        Cached bytes are dropped by app.core.cache.invalidate_config_cache,
+        which ConfigRepository calls when sources change.
     """
-    config = await service.get_configuration()
-    return config
+    async def _compute() -> bytes:
+        config = await service.get_configuration()
+        return config.model_dump_json().encode()
+
+    body = await config_cache.get_or_compute("config", _compute)
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,16 +1,46 @@
 """Dashboard API endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timezone
+from typing import Hashable
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
 from app.api.deps import get_dashboard_service
 from app.schemas.filters import OverviewRequest
 from app.schemas.dashboard import OverviewResponse
 from app.services.dashboard_service import DashboardService
+from app.core.cache import overview_cache
 from app.core.logging import logger
 
 router = APIRouter()
 
 
+def _overview_cache_key(request: OverviewRequest) -> Hashable:
+    """Build normalized cache key for overview request.
+
+    Args:
+        request: OverviewRequest with date_range and filters
+
+    Returns:
+        Tuple of (from, to, sorted sources, sorted products)
+
+    Note:
+        Dates are normalized to UTC and filter lists are de-duplicated and
+        sorted, so equivalent requests share one entry.
+    """
+    def _normalize(value: datetime) -> str:
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat()
+
+    return (
+        _normalize(request.date_range.from_),
+        _normalize(request.date_range.to),
+        tuple(sorted(set(request.filters.sources))),
+        tuple(sorted(set(request.filters.products))),
+    )
+
+
 @router.post("/dashboard/overview", response_model=OverviewResponse)
 async def get_dashboard_overview(
     request: OverviewRequest,
@@ -86,6 +116,9 @@ async def get_dashboard_overview(
         - Empty filters arrays mean "all" (no filtering applied)
         - Products are virtual groupings of database categories
         - Sentiment percentages always sum to 100 per day
+        - Responses are cached per normalized (date_range, sources, products)
+          for CACHE_TTL_METRICS seconds; concurrent identical requests share
+          one computation
     """
     try:
         logger.info(
@@ -100,16 +133,23 @@ async def get_dashboard_overview(
             },
         )
 
-        # Get overview data
-        overview = await service.get_overview(request)
+        async def _compute() -> bytes:
+            overview = await service.get_overview(request)
 
-        logger.info(
-            "dashboard_overview_completed",
-            total_reviews=overview.metrics.total_reviews.current,
-            dynamics_days=len(overview.sentiment_dynamics),
+            logger.info(
+                "dashboard_overview_completed",
+                total_reviews=overview.metrics.total_reviews.current,
+                dynamics_days=len(overview.sentiment_dynamics),
+            )
+
+            return overview.model_dump_json(by_alias=True).encode()
+
+        # Get overview data (cached for CACHE_TTL_METRICS seconds)
+        body = await overview_cache.get_or_compute(
+            _overview_cache_key(request), _compute
         )
 
-        return overview
+        return Response(content=body, media_type="application/json")
 
     except ValueError as e:
         logger.error("dashboard_overview_validation_error", error=str(e))
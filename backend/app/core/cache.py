@@ -0,0 +1,208 @@
+"""In-process response cache."""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import logger
+
+
+class ResponseCache:
+    """Async-safe TTL cache for serialized responses.
+
+    Features:
+    - TTL expiration per entry
+    - LRU eviction bounded by entry count and total bytes
+    - Single-flight: concurrent misses for the same key share one
+      computation instead of each hitting the database
+
+    Note:
+        Intended for use from a single event loop (one uvicorn worker).
+        All bookkeeping happens between awaits, so no locks are needed.
+    """
+
+    def __init__(self, name: str, ttl: float, max_entries: int, max_bytes: int):
+        """Initialize cache.
+
+        Args:
+            name: Cache name (for logs and stats)
+            ttl: Entry time-to-live in seconds (0 disables caching)
+            max_entries: Maximum number of entries
+            max_bytes: Maximum total size of cached values in bytes
+        """
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[Hashable, Tuple[float, bytes]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._bytes = 0
+        # Bumped by clear() so in-flight results computed before an
+        # invalidation are not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Get cached value if present and not expired.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached bytes or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: bytes) -> None:
+        """Store value, evicting least recently used entries if needed.
+
+        Args:
+            key: Cache key
+            value: Serialized value
+
+        Note:
+            Values larger than max_bytes are not cached.
+        """
+        if self.ttl <= 0 or len(value) > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._bytes += len(value)
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[bytes]],
+    ) -> bytes:
+        """Get cached value or compute it once for all concurrent callers.
+
+        Args:
+            key: Cache key
+            compute: Coroutine factory producing the serialized value
+
+        Returns:
+            Cached or freshly computed bytes
+
+        Raises:
+            Exception: Whatever compute raises (shared by all waiters)
+
+        Note:
+            If the caller running compute is cancelled (client disconnected),
+            the cancellation is not shared: waiters retry and one of them
+            runs compute instead.
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        while (inflight := self._inflight.get(key)) is not None:
+            try:
+                value = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # Re-raise our own cancellation, retry if only the leader left
+                if asyncio.current_task().cancelling() or not inflight.cancelled():
+                    raise
+                continue
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        # Mark exception as retrieved when nobody else was waiting
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        generation = self._generation
+
+        try:
+            value = await compute()
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            if generation == self._generation:
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def clear(self) -> None:
+        """Drop all cached entries and detach in-flight computations."""
+        self._entries.clear()
+        self._inflight.clear()
+        self._bytes = 0
+        self._generation += 1
+        logger.info("response_cache_cleared", cache=self.name)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with entries, bytes, hits and misses
+        """
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        """Remove entry and update byte accounting.
+
+        Args:
+            key: Cache key
+        """
+        _, value = self._entries.pop(key)
+        self._bytes -= len(value)
+
+
+# Serialized POST /api/dashboard/overview responses
+overview_cache = ResponseCache(
+    name="dashboard_overview",
+    ttl=settings.CACHE_TTL_METRICS,
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    max_bytes=settings.CACHE_MAX_BYTES,
+)
+
+# Serialized GET /api/config response (single entry)
+config_cache = ResponseCache(
+    name="config",
+    ttl=settings.CACHE_TTL_CONFIG,
+    max_entries=1,
+    max_bytes=settings.CACHE_MAX_BYTES,
+)
+
+
+def invalidate_config_cache() -> None:
+    """Drop cached /api/config response.
+
+    Call after sources are added, renamed or removed, or after product
+    mappings are reloaded.
+    """
+    config_cache.clear()
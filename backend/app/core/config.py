@@ -9,6 +9,27 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./database/bank_reviews.db"
+    # Connection pools (writer engine and read-only engine for dashboards)
+    DB_POOL_SIZE: int = 5
+    DB_READ_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    # Max concurrent fan-out queries on the reader pool (0 = sequential)
+    DB_FANOUT_CONCURRENCY: int = 4
+    # SQLite per-connection PRAGMAs
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -64000  # 64 MB (отрицательное значение = KiB)
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # 256 MB
+    # Reader mode: open the reader engine with a read-only URI (mode=ro)
+    # and a larger mmap so dashboard reads come from the OS page cache
+    SQLITE_READER_MODE: bool = False
+    SQLITE_READER_MMAP_SIZE: int = 1024 * 1024 * 1024  # 1 GB
+    # immutable=1 skips locking and change detection; only safe when
+    # nothing else writes to the database file while the app is running
+    # (init_db checkpoints its own schema writes before readers open)
+    SQLITE_READER_IMMUTABLE: bool = False
+    # Answer dashboard overview from daily_sentiment_rollup (app/db/rollup.py)
+    DASHBOARD_USE_ROLLUP: bool = False
     
     # Application
     APP_NAME: str = "Actionable Sentiment Backend"
@@ -25,6 +46,8 @@ class Settings(BaseSettings):
     # Cache
     CACHE_TTL_CONFIG: int = 3600  # 1 час для /config
     CACHE_TTL_METRICS: int = 300  # 5 минут для метрик
+    CACHE_MAX_ENTRIES: int = 512
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 64 MB на кэш
     
     class Config:
         """Pydantic config."""
@@ -0,0 +1,58 @@
+"""Concurrent execution of independent queries."""
+import asyncio
+from typing import Any, Awaitable, Callable, List
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+class QueryFanout:
+    """Run independent queries concurrently, each on its own session.
+
+    An AsyncSession (and its connection) can run only one statement at a
+    time, so queries that do not depend on each other are given separate
+    pooled sessions and awaited together. Latency becomes the slowest
+    query instead of the sum of all of them.
+
+    Note:
+        The semaphore is shared by all requests using this instance, so
+        max_concurrency caps fan-out connections process-wide. Keep it at
+        or below the pool size of the engine behind session_factory.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, max_concurrency: int):
+        """Initialize fan-out.
+
+        Args:
+            session_factory: Factory for per-query sessions
+            max_concurrency: Maximum number of queries running at once
+        """
+        self.session_factory = session_factory
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(self, *calls: Callable[[AsyncSession], Awaitable[Any]]) -> List[Any]:
+        """Run calls concurrently and return their results in order.
+
+        Args:
+            *calls: Callables taking a session and returning an awaitable
+
+        Returns:
+            List of results in the same order as calls
+
+        Raises:
+            Exception: First exception raised by any call
+        """
+        return list(await asyncio.gather(*(self._run_one(call) for call in calls)))
+
+    async def _run_one(self, call: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        """Run one call on a fresh session under the concurrency cap.
+
+        Args:
+            call: Callable taking a session and returning an awaitable
+
+        Returns:
+            Call result
+        """
+        async with self._semaphore:
+            async with self.session_factory() as session:
+                return await call(session)
@@ -0,0 +1,170 @@
+"""Daily rollup tables for dashboard queries.
+
+Rollups are maintained incrementally by SQLite triggers on the
+annotations table, so dashboard reads scale with
+days × sources × categories instead of annotation count.
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.logging import logger
+from app.models.daily_review_rollup import DailyReviewRollup
+from app.models.daily_sentiment_rollup import DailySentimentRollup
+
+
+# Statement fragments. {row} is NEW or OLD inside a trigger body.
+_SENTIMENT_ADD = """
+    INSERT INTO daily_sentiment_rollup
+        (date, source_id, category_id, sentiment_id, annotation_count, review_count)
+    SELECT r.date, r.source_id, {row}.category_id, {row}.sentiment_id, 1,
+           NOT EXISTS (
+               SELECT 1 FROM annotations a
+               WHERE a.review_id = {row}.review_id
+                 AND a.category_id = {row}.category_id
+                 AND a.sentiment_id = {row}.sentiment_id
+                 AND a.id <> {row}.id
+           )
+    FROM reviews r WHERE r.review_id = {row}.review_id
+    ON CONFLICT (date, source_id, category_id, sentiment_id) DO UPDATE SET
+        annotation_count = annotation_count + excluded.annotation_count,
+        review_count = review_count + excluded.review_count;
+"""
+
+_SENTIMENT_REMOVE = """
+    UPDATE daily_sentiment_rollup SET
+        annotation_count = annotation_count - 1,
+        review_count = review_count - NOT EXISTS (
+            SELECT 1 FROM annotations a
+            WHERE a.review_id = {row}.review_id
+              AND a.category_id = {row}.category_id
+              AND a.sentiment_id = {row}.sentiment_id
+              AND a.id <> {row}.id
+        )
+    WHERE (date, source_id) = (
+            SELECT r.date, r.source_id FROM reviews r WHERE r.review_id = {row}.review_id
+        )
+      AND category_id = {row}.category_id
+      AND sentiment_id = {row}.sentiment_id;
+    DELETE FROM daily_sentiment_rollup
+    WHERE (date, source_id) = (
+            SELECT r.date, r.source_id FROM reviews r WHERE r.review_id = {row}.review_id
+        )
+      AND category_id = {row}.category_id
+      AND sentiment_id = {row}.sentiment_id
+      AND annotation_count <= 0;
+"""
+
+_REVIEW_ADD = """
+    INSERT INTO daily_review_rollup (date, source_id, annotation_count, review_count)
+    SELECT r.date, r.source_id, 1,
+           NOT EXISTS (
+               SELECT 1 FROM annotations a
+               WHERE a.review_id = {row}.review_id AND a.id <> {row}.id
+           )
+    FROM reviews r WHERE r.review_id = {row}.review_id
+    ON CONFLICT (date, source_id) DO UPDATE SET
+        annotation_count = annotation_count + excluded.annotation_count,
+        review_count = review_count + excluded.review_count;
+"""
+
+_REVIEW_REMOVE = """
+    UPDATE daily_review_rollup SET
+        annotation_count = annotation_count - 1,
+        review_count = review_count - NOT EXISTS (
+            SELECT 1 FROM annotations a
+            WHERE a.review_id = {row}.review_id AND a.id <> {row}.id
+        )
+    WHERE (date, source_id) = (
+        SELECT r.date, r.source_id FROM reviews r WHERE r.review_id = {row}.review_id
+    );
+    DELETE FROM daily_review_rollup
+    WHERE (date, source_id) = (
+            SELECT r.date, r.source_id FROM reviews r WHERE r.review_id = {row}.review_id
+        )
+      AND annotation_count <= 0;
+"""
+
+ROLLUP_TRIGGERS = {
+    "trg_annotations_rollup_insert": (
+        "AFTER INSERT ON annotations",
+        _SENTIMENT_ADD.format(row="NEW") + _REVIEW_ADD.format(row="NEW"),
+    ),
+    "trg_annotations_rollup_delete": (
+        "AFTER DELETE ON annotations",
+        _SENTIMENT_REMOVE.format(row="OLD") + _REVIEW_REMOVE.format(row="OLD"),
+    ),
+    "trg_annotations_rollup_update": (
+        "AFTER UPDATE OF review_id, category_id, sentiment_id ON annotations "
+        "WHEN OLD.review_id IS NOT NEW.review_id "
+        "OR OLD.category_id IS NOT NEW.category_id "
+        "OR OLD.sentiment_id IS NOT NEW.sentiment_id",
+        _SENTIMENT_REMOVE.format(row="OLD") + _SENTIMENT_ADD.format(row="NEW"),
+    ),
+    "trg_annotations_rollup_update_review": (
+        "AFTER UPDATE OF review_id ON annotations "
+        "WHEN OLD.review_id IS NOT NEW.review_id",
+        _REVIEW_REMOVE.format(row="OLD") + _REVIEW_ADD.format(row="NEW"),
+    ),
+}
+
+_BACKFILL_SENTIMENT = """
+    INSERT INTO daily_sentiment_rollup
+        (date, source_id, category_id, sentiment_id, annotation_count, review_count)
+    SELECT r.date, r.source_id, a.category_id, a.sentiment_id,
+           COUNT(a.id), COUNT(DISTINCT a.review_id)
+    FROM annotations a
+    JOIN reviews r ON r.review_id = a.review_id
+    GROUP BY r.date, r.source_id, a.category_id, a.sentiment_id
+"""
+
+_BACKFILL_REVIEW = """
+    INSERT INTO daily_review_rollup (date, source_id, annotation_count, review_count)
+    SELECT r.date, r.source_id, COUNT(a.id), COUNT(DISTINCT a.review_id)
+    FROM annotations a
+    JOIN reviews r ON r.review_id = a.review_id
+    GROUP BY r.date, r.source_id
+"""
+
+
+async def rebuild_rollup(conn: AsyncConnection) -> None:
+    """Recompute rollup tables from reviews and annotations.
+
+    Args:
+        conn: Database connection (inside a transaction)
+
+    Note:
+        Needed only after bulk changes that bypass the triggers, e.g.
+        edits of reviews.date or reviews.source_id.
+    """
+    await conn.execute(text("DELETE FROM daily_sentiment_rollup"))
+    await conn.execute(text("DELETE FROM daily_review_rollup"))
+    await conn.execute(text(_BACKFILL_SENTIMENT))
+    await conn.execute(text(_BACKFILL_REVIEW))
+
+
+async def ensure_rollup(conn: AsyncConnection) -> None:
+    """Create rollup tables and triggers if missing, backfilling new tables.
+
+    Args:
+        conn: Database connection (inside a transaction)
+    """
+    def _missing_tables(sync_conn) -> bool:
+        tables = [DailySentimentRollup.__table__, DailyReviewRollup.__table__]
+        missing = [
+            table for table in tables
+            if not sync_conn.dialect.has_table(sync_conn, table.name)
+        ]
+        for table in missing:
+            table.create(sync_conn)
+        return bool(missing)
+
+    created = await conn.run_sync(_missing_tables)
+
+    for name, (event, body) in ROLLUP_TRIGGERS.items():
+        await conn.execute(
+            text(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+        )
+
+    if created:
+        await rebuild_rollup(conn)
+        logger.info("dashboard_rollup_backfilled")
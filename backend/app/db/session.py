@@ -1,33 +1,171 @@
 """Database session management."""
+from pathlib import Path
 from typing import AsyncGenerator
 
-from sqlalchemy import text
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 
 from app.core.config import settings
+from app.core.logging import logger
+from app.db.fanout import QueryFanout
+from app.db.rollup import ensure_rollup
+from app.models.annotation import Annotation
+from app.models.review import Review
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    connect_args={"check_same_thread": False}
-)
+# "sqlite" (aiosqlite) or "postgresql" (asyncpg)
+DATABASE_BACKEND = make_url(settings.DATABASE_URL).get_backend_name()
+
+
+def _sqlite_pragmas(read_only: bool) -> list:
+    """Get PRAGMA statements applied to every new SQLite connection.
+
+    Args:
+        read_only: Whether the connection belongs to the reader pool
+
+    Returns:
+        List of PRAGMA statements
+    """
+    pragmas = [
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if read_only:
+        # Reject writes on reader connections at the SQLite level
+        pragmas.append("PRAGMA query_only=ON")
+
+    if read_only and settings.SQLITE_READER_MODE:
+        # Every connection maps the same file pages, so they share the
+        # OS page cache instead of each filling its own buffer
+        pragmas.append(f"PRAGMA mmap_size={settings.SQLITE_READER_MMAP_SIZE}")
+    else:
+        pragmas.append(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    return pragmas
+
+
+def _reader_url() -> str:
+    """Get database URL for the reader engine.
+
+    Returns:
+        Read-only SQLite URI (file:...?mode=ro) in reader mode,
+        otherwise DATABASE_URL unchanged
+
+    Note:
+        Falls back to DATABASE_URL for non-file databases (":memory:"),
+        where a read-only URI would open a different, empty database.
+    """
+    url = make_url(settings.DATABASE_URL)
+    if (
+        not settings.SQLITE_READER_MODE
+        or url.get_backend_name() != "sqlite"
+        or not url.database
+        or url.database == ":memory:"
+    ):
+        return settings.DATABASE_URL
+
+    query = {"mode": "ro", "uri": "true"}
+    if settings.SQLITE_READER_IMMUTABLE:
+        query["immutable"] = "1"
+
+    path = Path(url.database).resolve().as_posix()
+    return url.set(database=f"file:{path}", query=query).render_as_string(
+        hide_password=False
+    )
+
+
+def _connect_args(read_only: bool) -> dict:
+    """Get driver connect arguments for the configured backend.
+
+    Args:
+        read_only: Whether the connection belongs to the reader pool
+
+    Returns:
+        Dictionary passed as create_async_engine(connect_args=...)
+    """
+    if DATABASE_BACKEND == "sqlite":
+        return {"check_same_thread": False}
+    if DATABASE_BACKEND == "postgresql" and read_only:
+        # Server-side equivalent of PRAGMA query_only
+        return {"server_settings": {"default_transaction_read_only": "on"}}
+    return {}
+
+
+def _create_engine(read_only: bool) -> AsyncEngine:
+    """Create async engine with its own pool and per-connection setup.
+
+    Args:
+        read_only: Create the reader engine (read-only connections)
+
+    Returns:
+        AsyncEngine instance
+    """
+    new_engine = create_async_engine(
+        _reader_url() if read_only else settings.DATABASE_URL,
+        echo=settings.DEBUG,
+        connect_args=_connect_args(read_only),
+        # aiosqlite defaults to NullPool (a new connection per checkout)
+        poolclass=AsyncAdaptedQueuePool,
+        pool_pre_ping=True,
+        pool_size=settings.DB_READ_POOL_SIZE if read_only else settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+
+    if DATABASE_BACKEND != "sqlite":
+        return new_engine
 
-# Session factory
+    pragmas = _sqlite_pragmas(read_only)
+
+    # PRAGMAs are per connection, so run them whenever the pool opens one
+    @event.listens_for(new_engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return new_engine
+
+
+# Writer engine: schema setup, ingestion and any other writes
+engine = _create_engine(read_only=False)
+
+# Reader engine: separate pool of query_only connections for dashboard reads.
+# Under WAL, readers never block the writer and vice versa. With
+# SQLITE_READER_MODE the file is opened read-only (mode=ro) and mmapped.
+read_engine = _create_engine(read_only=True)
+
+# Session factories
 async_session_factory = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
 
+read_session_factory = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
+# Process-wide fan-out for independent dashboard queries
+read_fanout = QueryFanout(
+    read_session_factory,
+    max_concurrency=settings.DB_FANOUT_CONCURRENCY,
+)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency for FastAPI to get database session.
-    
+
     Yields:
         AsyncSession: Database session
     """
@@ -39,10 +177,61 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
 
 async def init_db() -> None:
-    """Initialize database with optimal SQLite settings."""
+    """Initialize database schema extras and WAL mode.
+
+    Note:
+        Connection-level settings (cache_size, temp_store, mmap_size, ...)
+        are applied to every pooled connection by the engine connect
+        event, not here. On PostgreSQL only indexes are created: WAL is
+        always on and rollup triggers are SQLite-specific.
+    """
     async with engine.begin() as conn:
-        await conn.execute(text("PRAGMA journal_mode=WAL"))
-        await conn.execute(text("PRAGMA synchronous=NORMAL"))
-        await conn.execute(text("PRAGMA cache_size=-64000"))
-        await conn.execute(text("PRAGMA temp_store=MEMORY"))
+        if DATABASE_BACKEND == "sqlite":
+            # journal_mode is persistent in the database file
+            await conn.execute(text("PRAGMA journal_mode=WAL"))
+
+        # Composite covering indexes declared on the models
+        def _create_indexes(sync_conn) -> None:
+            for table in (Review.__table__, Annotation.__table__):
+                for index in table.indexes:
+                    index.create(sync_conn, checkfirst=True)
+
+        await conn.run_sync(_create_indexes)
+
+        # Dashboard rollup tables and their maintenance triggers
+        if settings.DASHBOARD_USE_ROLLUP:
+            if DATABASE_BACKEND == "sqlite":
+                await ensure_rollup(conn)
+            else:
+                logger.warning(
+                    "dashboard_rollup_unsupported",
+                    backend=DATABASE_BACKEND,
+                )
+
+    if DATABASE_BACKEND == "sqlite" and settings.SQLITE_READER_IMMUTABLE:
+        await _checkpoint_wal()
+
+
+async def _checkpoint_wal() -> None:
+    """Move the WAL written by init_db into the main database file.
+
+    Note:
+        immutable=1 reader connections ignore the WAL, so indexes and
+        rollup tables created above would stay invisible to them until
+        the next checkpoint. Runs before the reader pool opens anything.
+    """
+    async with engine.connect() as conn:
+        result = await conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        busy, wal_pages, checkpointed = result.one()
+    if busy:
+        logger.warning(
+            "sqlite_wal_checkpoint_incomplete",
+            wal_pages=wal_pages,
+            checkpointed=checkpointed,
+        )
+
 
+async def close_db() -> None:
+    """Dispose writer and reader connection pools."""
+    await engine.dispose()
+    await read_engine.dispose()
@@ -2,7 +2,7 @@
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Dict, Any
 
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -11,10 +11,11 @@ from app.api.deps import get_db
 from app.core.config import settings
 from app.core.exceptions import ApplicationException
 from app.core.logging import configure_logging, logger
-from app.db.session import init_db
+from app.db.session import close_db, init_db
 from app.middleware.error_handler import application_exception_handler
 from app.middleware.logging_middleware import LoggingMiddleware
 from app.utils.db_health import (
+    analyze_query_plans,
     check_database_health,
     verify_database_schema,
     get_database_stats,
@@ -60,11 +61,17 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             # In development, just log the warning and continue
             logger.warning("continuing_without_valid_database_schema")
 
+    # Index advisor: report full-table scans in dashboard queries
+    from app.db.session import read_session_factory
+
+    async with read_session_factory() as session:
+        app.state.query_plans = await analyze_query_plans(session)
+
     yield
 
     # Shutdown
     logger.info("application_shutting_down")
-    # Add cleanup logic here if needed
+    await close_db()
 
 
 # Create FastAPI application
@@ -101,15 +108,20 @@ async def health_check() -> Dict[str, str]:
 
 
 @app.get("/health/database")
-async def database_health_check(db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
+async def database_health_check(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+) -> Dict[str, Any]:
     """Database health check endpoint.
 
     Returns comprehensive database health information including:
     - Table existence check
     - Row counts
     - Database statistics
+    - Query plan report from the startup index advisor
 
     Args:
+        request: Incoming request (for app state)
         db: Database session (injected via Depends)
 
     Returns:
@@ -127,6 +139,7 @@ async def database_health_check(db: AsyncSession = Depends(get_db)) -> Dict[str,
         "views": health["views_exist"],
         "row_counts": health["row_counts"],
         "statistics": stats,
+        "query_plans": getattr(request.app.state, "query_plans", None),
         "error": health.get("error"),
     }
 
@@ -2,6 +2,8 @@
 from app.db.base import Base
 from app.models.annotation import Annotation
 from app.models.category import Category
+from app.models.daily_review_rollup import DailyReviewRollup
+from app.models.daily_sentiment_rollup import DailySentimentRollup
 from app.models.review import Review
 from app.models.sentiment import Sentiment
 from app.models.source import Source
@@ -13,5 +15,7 @@ __all__ = [
     "Source",
     "Category",
     "Sentiment",
+    "DailySentimentRollup",
+    "DailyReviewRollup",
 ]
 
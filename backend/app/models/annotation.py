@@ -1,5 +1,5 @@
 """Annotation model - аннотации отзывов."""
-from sqlalchemy import Column, Integer, Text, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, Integer, Text, TIMESTAMP, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -9,6 +9,21 @@ class Annotation(Base):
     """Модель аннотации - связь отзыва с категорией и тональностью."""
     
     __tablename__ = "annotations"
+    __table_args__ = (
+        # Покрывающие индексы для JOIN reviews → annotations и фильтра
+        # по категориям (в SQLite id входит в индекс как rowid,
+        # в PostgreSQL - INCLUDE)
+        Index(
+            "ix_annotations_review_category_sentiment",
+            "review_id", "category_id", "sentiment_id",
+            postgresql_include=["id"],
+        ),
+        Index(
+            "ix_annotations_category_review_sentiment",
+            "category_id", "review_id", "sentiment_id",
+            postgresql_include=["id"],
+        ),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     review_id = Column(
@@ -27,7 +42,7 @@ class Annotation(Base):
         nullable=False
     )
     summary = Column(Text, nullable=False)
-    created_at = Column(TIMESTAMP, server_default="CURRENT_TIMESTAMP")
+    created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
     
     # Relationships
     review = relationship("Review", back_populates="annotations")
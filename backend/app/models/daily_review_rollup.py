@@ -0,0 +1,19 @@
+"""DailyReviewRollup model - дневное число аннотированных отзывов."""
+from sqlalchemy import Column, Integer, Date, ForeignKey
+
+from app.db.base import Base
+
+
+class DailyReviewRollup(Base):
+    """Дневное число уникальных отзывов с аннотациями по источнику.
+
+    Уникальные отзывы не суммируются по категориям и тональностям,
+    поэтому хранятся отдельно от DailySentimentRollup.
+    """
+
+    __tablename__ = "daily_review_rollup"
+
+    date = Column(Date, primary_key=True)
+    source_id = Column(Integer, ForeignKey("sources.id"), primary_key=True)
+    annotation_count = Column(Integer, nullable=False, default=0)
+    review_count = Column(Integer, nullable=False, default=0)
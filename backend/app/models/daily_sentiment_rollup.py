@@ -0,0 +1,20 @@
+"""DailySentimentRollup model - дневные агрегаты аннотаций."""
+from sqlalchemy import Column, Integer, Date, ForeignKey
+
+from app.db.base import Base
+
+
+class DailySentimentRollup(Base):
+    """Дневной агрегат аннотаций по источнику, категории и тональности.
+
+    Поддерживается триггерами на таблице annotations (см. app.db.rollup).
+    """
+
+    __tablename__ = "daily_sentiment_rollup"
+
+    date = Column(Date, primary_key=True)
+    source_id = Column(Integer, ForeignKey("sources.id"), primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+    sentiment_id = Column(Integer, ForeignKey("sentiments.id"), primary_key=True)
+    annotation_count = Column(Integer, nullable=False, default=0)
+    review_count = Column(Integer, nullable=False, default=0)
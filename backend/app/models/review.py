@@ -1,5 +1,5 @@
 """Review model - отзывы клиентов."""
-from sqlalchemy import Column, Integer, Text, Date, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, Integer, Text, Date, TIMESTAMP, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -9,13 +9,21 @@ class Review(Base):
     """Модель отзыва клиента."""
     
     __tablename__ = "reviews"
+    __table_args__ = (
+        # Покрывающий индекс для фильтра по периоду и источнику
+        # (в SQLite review_id входит в индекс как rowid, в PostgreSQL - INCLUDE)
+        Index(
+            "ix_reviews_date_source", "date", "source_id",
+            postgresql_include=["review_id"],
+        ),
+    )
     
     # ⚠️ Primary key is review_id, not id!
     review_id = Column(Integer, primary_key=True, autoincrement=True)
     date = Column(Date, nullable=False)
     text = Column(Text, nullable=False)
     source_id = Column(Integer, ForeignKey("sources.id"), nullable=False)
-    created_at = Column(TIMESTAMP, server_default="CURRENT_TIMESTAMP")
+    created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
     
     # Relationships
     source = relationship("Source", back_populates="reviews")
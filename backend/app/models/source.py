@@ -1,5 +1,5 @@
 """Source model - источники отзывов."""
-from sqlalchemy import Column, Integer, Text, TIMESTAMP
+from sqlalchemy import Column, Integer, Text, TIMESTAMP, func
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -12,7 +12,7 @@ class Source(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(Text, nullable=False, unique=True)
-    created_at = Column(TIMESTAMP, server_default="CURRENT_TIMESTAMP")
+    created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
     
     # Relationships
     reviews = relationship("Review", back_populates="source")
@@ -1,9 +1,10 @@
 """Repository for configuration data (sources, categories)."""
 
-from typing import List
+from typing import List, Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import invalidate_config_cache
 from app.models.source import Source
 from app.models.category import Category
 from app.repositories.base import BaseRepository
@@ -18,6 +19,48 @@ class ConfigRepository(BaseRepository[Source]):
     def __init__(self, db: AsyncSession):
         super().__init__(Source, db)
 
+    async def create(self, obj_in: dict) -> Source:
+        """Create a source and invalidate cached /api/config.
+
+        Args:
+            obj_in: Dictionary with Source attributes
+
+        Returns:
+            Created Source instance
+        """
+        source = await super().create(obj_in)
+        invalidate_config_cache()
+        return source
+
+    async def update(self, id: int, obj_in: dict) -> Optional[Source]:
+        """Update a source and invalidate cached /api/config.
+
+        Args:
+            id: Source ID
+            obj_in: Dictionary with updated attributes
+
+        Returns:
+            Updated Source instance or None if not found
+        """
+        source = await super().update(id, obj_in)
+        if source is not None:
+            invalidate_config_cache()
+        return source
+
+    async def delete(self, id: int) -> bool:
+        """Delete a source and invalidate cached /api/config.
+
+        Args:
+            id: Source ID
+
+        Returns:
+            True if deleted, False if not found
+        """
+        deleted = await super().delete(id)
+        if deleted:
+            invalidate_config_cache()
+        return deleted
+
     async def get_all_sources(self) -> List[Source]:
         """Get all sources from database.
 
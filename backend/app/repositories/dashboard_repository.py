@@ -3,6 +3,7 @@
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Optional, Any
 from sqlalchemy import select, func, distinct, case, and_, or_
+from sqlalchemy.sql import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.review import Review
@@ -10,6 +11,10 @@ from app.models.annotation import Annotation
 from app.models.sentiment import Sentiment
 from app.models.category import Category
 from app.models.source import Source
+from app.models.daily_review_rollup import DailyReviewRollup
+from app.models.daily_sentiment_rollup import DailySentimentRollup
+from app.db.fanout import QueryFanout
+from app.repositories.overview_cube import OverviewCube
 
 
 class DashboardRepository:
@@ -18,13 +23,67 @@ class DashboardRepository:
     Handles complex queries with filters, aggregations, and JOINs.
     """
 
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        use_rollup: bool = False,
+        fanout: Optional[QueryFanout] = None,
+    ):
         """Initialize repository with database session.
 
         Args:
             db: AsyncSession instance
+            use_rollup: Answer overview queries (get_overview_cube,
+                get_top_topics_for_range) from daily rollup tables
+                instead of raw reviews/annotations
+            fanout: Run independent queries of get_overview_cube
+                concurrently on separate sessions (None: sequentially on db)
+
+        Note:
+            Rollup tables are maintained by SQLite triggers, so use_rollup
+            is ignored on PostgreSQL, which uses FILTER aggregates instead.
         """
         self.db = db
+        self.dialect = db.bind.dialect.name if db.bind is not None else "sqlite"
+        self.use_rollup = use_rollup and self.dialect == "sqlite"
+        self.fanout = fanout
+
+    def _with_session(self, db: AsyncSession) -> "DashboardRepository":
+        """Get a repository with the same settings bound to another session.
+
+        Args:
+            db: AsyncSession instance
+
+        Returns:
+            DashboardRepository instance without fan-out
+        """
+        return DashboardRepository(db, use_rollup=self.use_rollup)
+
+    def _review_day(self) -> ColumnElement:
+        """Get expression for the review day used in GROUP BY.
+
+        Returns:
+            Review.date on PostgreSQL (a real DATE column, so grouping
+            can follow index order), date(Review.date) on SQLite (dates
+            are stored as text; malformed values become NULL)
+        """
+        if self.dialect == "postgresql":
+            return Review.date
+        return func.date(Review.date)
+
+    def _sentiment_count(self, sentiment_name: str) -> ColumnElement:
+        """Get aggregate counting annotations with a given sentiment.
+
+        Args:
+            sentiment_name: Sentiment name in DB format (e.g., "позитив")
+
+        Returns:
+            COUNT(...) FILTER (WHERE ...) on PostgreSQL,
+            SUM(CASE ...) on SQLite
+        """
+        if self.dialect == "postgresql":
+            return func.count(Annotation.id).filter(Sentiment.name == sentiment_name)
+        return func.sum(case((Sentiment.name == sentiment_name, 1), else_=0))
 
     async def get_review_metrics(
         self,
@@ -158,7 +217,7 @@ class DashboardRepository:
         result = await self.db.execute(query)
         rows = result.all()
 
-        return [{"date": row.date, "value": row.value} for row in rows]
+        return [{"date": str(row.date), "value": row.value} for row in rows]
 
     async def get_sentiment_dynamics(
         self,
@@ -304,6 +363,89 @@ class DashboardRepository:
 
         return [row.name for row in rows]
 
+    async def get_top_topics_for_range(
+        self,
+        from_date: datetime,
+        to_date: datetime,
+        source_names: Optional[List[str]] = None,
+        category_names: Optional[List[str]] = None,
+        limit: int = 3,
+    ) -> Dict[str, List[str]]:
+        """Get top N categories (topics) for every date in a range.
+
+        Args:
+            from_date: Start date (inclusive)
+            to_date: End date (inclusive)
+            source_names: List of source names (DB format) or None for all
+            category_names: List of category names to filter or None for all
+            limit: Number of top topics per day (default: 3)
+
+        Returns:
+            Dictionary mapping date (YYYY-MM-DD) to category names
+            (max 'limit' items), dates without annotations are absent
+
+        Note:
+            Batched equivalent of get_top_topics_for_date: ranks categories
+            with ROW_NUMBER() partitioned by date, so the whole range is
+            served by one query. Ties are broken by category id.
+        """
+        if self.use_rollup:
+            return await self._get_top_topics_from_rollup(
+                from_date, to_date, source_names, category_names, limit
+            )
+
+        start = from_date.date() if isinstance(from_date, datetime) else from_date
+        end = to_date.date() if isinstance(to_date, datetime) else to_date
+        mention_count = func.count(Annotation.id)
+        review_day = self._review_day()
+
+        # Rank categories within each day by mention count
+        ranked = select(
+            review_day.label("date"),
+            Category.name.label("name"),
+            func.row_number().over(
+                partition_by=review_day,
+                order_by=(mention_count.desc(), Category.id),
+            ).label("rank"),
+        ).select_from(Category)
+
+        # JOINs
+        ranked = ranked.join(Annotation, Category.id == Annotation.category_id)
+        ranked = ranked.join(Review, Annotation.review_id == Review.review_id)
+
+        # Apply date filter
+        ranked = ranked.where(and_(Review.date >= start, Review.date <= end))
+
+        # Apply source filter if provided
+        if source_names:
+            ranked = ranked.join(Source, Review.source_id == Source.id)
+            ranked = ranked.where(Source.name.in_(source_names))
+
+        # Apply category filter if provided
+        if category_names:
+            ranked = ranked.where(Category.name.in_(category_names))
+
+        ranked = ranked.group_by(review_day, Category.id, Category.name)
+        ranked = ranked.subquery()
+
+        # Keep top N per day
+        query = (
+            select(ranked.c.date, ranked.c.name)
+            .where(ranked.c.rank <= limit)
+            .order_by(ranked.c.date, ranked.c.rank)
+        )
+
+        # Execute query
+        result = await self.db.execute(query)
+        rows = result.all()
+
+        topics: Dict[str, List[str]] = {}
+        for row in rows:
+            if row.date is not None:
+                topics.setdefault(str(row.date), []).append(row.name)
+
+        return topics
+
     async def get_sparkline_by_sentiment(
         self,
         to_date: datetime,
@@ -370,4 +512,296 @@ class DashboardRepository:
         result = await self.db.execute(query)
         rows = result.all()
 
-        return [{"date": row.date, "value": row.value} for row in rows]
+        return [{"date": str(row.date), "value": row.value} for row in rows]
+
+    async def get_overview_cube(
+        self,
+        from_date: datetime,
+        to_date: datetime,
+        source_names: Optional[List[str]] = None,
+        category_names: Optional[List[str]] = None,
+        topics_from_date: Optional[datetime] = None,
+    ) -> OverviewCube:
+        """Get daily aggregates for the whole overview in one grouped scan.
+
+        Args:
+            from_date: Start date of the scan (inclusive). Should cover the
+                previous period and the sparkline window.
+            to_date: End date (inclusive)
+            source_names: List of source names (DB format) or None for all
+            category_names: List of category names or None for all
+            topics_from_date: Start date for top topics ranking
+                (default: from_date)
+
+        Returns:
+            OverviewCube that answers metrics, sparkline and dynamics
+            slices without further queries
+
+        Note:
+            Runs two queries regardless of range length: one grouped by
+            day for review/sentiment counts and one ranking topics per
+            day (see get_top_topics_for_range). In rollup mode the same
+            data is read from daily rollup tables. With fanout both
+            queries run concurrently on separate sessions.
+        """
+        start = from_date.date() if isinstance(from_date, datetime) else from_date
+        end = to_date.date() if isinstance(to_date, datetime) else to_date
+        if topics_from_date is None:
+            topics_start = start
+        elif isinstance(topics_from_date, datetime):
+            topics_start = topics_from_date.date()
+        else:
+            topics_start = topics_from_date
+
+        if self.fanout is None:
+            days = await self._get_day_aggregates(
+                start, end, source_names, category_names
+            )
+            topics = await self.get_top_topics_for_range(
+                from_date=topics_start,
+                to_date=end,
+                source_names=source_names,
+                category_names=category_names,
+            )
+        else:
+            days, topics = await self.fanout.run(
+                lambda db: self._with_session(db)._get_day_aggregates(
+                    start, end, source_names, category_names
+                ),
+                lambda db: self._with_session(db).get_top_topics_for_range(
+                    from_date=topics_start,
+                    to_date=end,
+                    source_names=source_names,
+                    category_names=category_names,
+                ),
+            )
+
+        return OverviewCube(days=days, topics=topics)
+
+    async def _get_day_aggregates(
+        self,
+        from_date: date,
+        to_date: date,
+        source_names: Optional[List[str]] = None,
+        category_names: Optional[List[str]] = None,
+    ) -> Dict[str, Dict[str, int]]:
+        """Get day aggregates for OverviewCube.
+
+        Args:
+            from_date: Start date (inclusive)
+            to_date: End date (inclusive)
+            source_names: List of source names (DB format) or None for all
+            category_names: List of category names or None for all
+
+        Returns:
+            Mapping of YYYY-MM-DD to total_reviews, positive, neutral,
+            negative and total
+        """
+        if self.use_rollup:
+            return await self._get_day_aggregates_from_rollup(
+                from_date, to_date, source_names, category_names
+            )
+
+        # Day aggregates: unique reviews and annotation counts by sentiment
+        review_day = self._review_day()
+        query = select(
+            review_day.label("date"),
+            func.count(distinct(Review.review_id)).label("total_reviews"),
+            self._sentiment_count("позитив").label("positive"),
+            self._sentiment_count("нейтральный").label("neutral"),
+            self._sentiment_count("негатив").label("negative"),
+            func.count(Annotation.id).label("total"),
+        ).select_from(Review)
+
+        # JOINs
+        query = query.join(Annotation, Review.review_id == Annotation.review_id)
+        query = query.join(Sentiment, Annotation.sentiment_id == Sentiment.id)
+
+        # Apply date filter
+        query = query.where(and_(Review.date >= from_date, Review.date <= to_date))
+
+        # Apply source filter if provided
+        if source_names:
+            query = query.join(Source, Review.source_id == Source.id)
+            query = query.where(Source.name.in_(source_names))
+
+        # Apply category filter if provided
+        if category_names:
+            query = query.join(Category, Annotation.category_id == Category.id)
+            query = query.where(Category.name.in_(category_names))
+
+        query = query.group_by(review_day)
+
+        result = await self.db.execute(query)
+        return {
+            str(row.date): {
+                "total_reviews": row.total_reviews or 0,
+                "positive": row.positive or 0,
+                "neutral": row.neutral or 0,
+                "negative": row.negative or 0,
+                "total": row.total or 0,
+            }
+            for row in result.all()
+            if row.date is not None
+        }
+
+    async def _get_day_aggregates_from_rollup(
+        self,
+        from_date: date,
+        to_date: date,
+        source_names: Optional[List[str]] = None,
+        category_names: Optional[List[str]] = None,
+    ) -> Dict[str, Dict[str, int]]:
+        """Get OverviewCube day aggregates from rollup tables.
+
+        Args:
+            from_date: Start date (inclusive)
+            to_date: End date (inclusive)
+            source_names: List of source names (DB format) or None for all
+            category_names: List of category names or None for all
+
+        Returns:
+            Mapping of YYYY-MM-DD to total_reviews, positive, neutral,
+            negative and total
+
+        Note:
+            Unique reviews are not additive across categories, so with a
+            category filter total_reviews is counted from raw annotations.
+        """
+        rollup = DailySentimentRollup
+
+        # Annotation counts by sentiment
+        query = select(
+            func.date(rollup.date).label("date"),
+            func.sum(
+                case((Sentiment.name == "позитив", rollup.annotation_count), else_=0)
+            ).label("positive"),
+            func.sum(
+                case((Sentiment.name == "нейтральный", rollup.annotation_count), else_=0)
+            ).label("neutral"),
+            func.sum(
+                case((Sentiment.name == "негатив", rollup.annotation_count), else_=0)
+            ).label("negative"),
+            func.sum(rollup.annotation_count).label("total"),
+        ).select_from(rollup)
+
+        query = query.join(Sentiment, rollup.sentiment_id == Sentiment.id)
+        query = query.where(and_(rollup.date >= from_date, rollup.date <= to_date))
+
+        if source_names:
+            query = query.join(Source, rollup.source_id == Source.id)
+            query = query.where(Source.name.in_(source_names))
+
+        if category_names:
+            query = query.join(Category, rollup.category_id == Category.id)
+            query = query.where(Category.name.in_(category_names))
+
+        query = query.group_by(func.date(rollup.date))
+
+        result = await self.db.execute(query)
+        days = {
+            str(row.date): {
+                "total_reviews": 0,
+                "positive": row.positive or 0,
+                "neutral": row.neutral or 0,
+                "negative": row.negative or 0,
+                "total": row.total or 0,
+            }
+            for row in result.all()
+            if row.date is not None
+        }
+
+        # Unique reviews with annotations
+        if category_names:
+            query = select(
+                func.date(Review.date).label("date"),
+                func.count(distinct(Review.review_id)).label("total_reviews"),
+            ).select_from(Review)
+            query = query.join(Annotation, Review.review_id == Annotation.review_id)
+            query = query.join(Category, Annotation.category_id == Category.id)
+            query = query.where(and_(Review.date >= from_date, Review.date <= to_date))
+            query = query.where(Category.name.in_(category_names))
+            if source_names:
+                query = query.join(Source, Review.source_id == Source.id)
+                query = query.where(Source.name.in_(source_names))
+            query = query.group_by(func.date(Review.date))
+        else:
+            reviews = DailyReviewRollup
+            query = select(
+                func.date(reviews.date).label("date"),
+                func.sum(reviews.review_count).label("total_reviews"),
+            ).select_from(reviews)
+            query = query.where(and_(reviews.date >= from_date, reviews.date <= to_date))
+            if source_names:
+                query = query.join(Source, reviews.source_id == Source.id)
+                query = query.where(Source.name.in_(source_names))
+            query = query.group_by(func.date(reviews.date))
+
+        result = await self.db.execute(query)
+        for row in result.all():
+            day = days.get(str(row.date))
+            if day is not None:
+                day["total_reviews"] = row.total_reviews or 0
+
+        return days
+
+    async def _get_top_topics_from_rollup(
+        self,
+        from_date: datetime,
+        to_date: datetime,
+        source_names: Optional[List[str]] = None,
+        category_names: Optional[List[str]] = None,
+        limit: int = 3,
+    ) -> Dict[str, List[str]]:
+        """Rollup variant of get_top_topics_for_range.
+
+        Args:
+            from_date: Start date (inclusive)
+            to_date: End date (inclusive)
+            source_names: List of source names (DB format) or None for all
+            category_names: List of category names to filter or None for all
+            limit: Number of top topics per day (default: 3)
+
+        Returns:
+            Dictionary mapping date (YYYY-MM-DD) to category names
+        """
+        rollup = DailySentimentRollup
+        start = from_date.date() if isinstance(from_date, datetime) else from_date
+        end = to_date.date() if isinstance(to_date, datetime) else to_date
+        mention_count = func.sum(rollup.annotation_count)
+
+        ranked = select(
+            func.date(rollup.date).label("date"),
+            Category.name.label("name"),
+            func.row_number().over(
+                partition_by=func.date(rollup.date),
+                order_by=(mention_count.desc(), Category.id),
+            ).label("rank"),
+        ).select_from(Category)
+
+        ranked = ranked.join(rollup, Category.id == rollup.category_id)
+        ranked = ranked.where(and_(rollup.date >= start, rollup.date <= end))
+
+        if source_names:
+            ranked = ranked.join(Source, rollup.source_id == Source.id)
+            ranked = ranked.where(Source.name.in_(source_names))
+
+        if category_names:
+            ranked = ranked.where(Category.name.in_(category_names))
+
+        ranked = ranked.group_by(func.date(rollup.date), Category.id, Category.name)
+        ranked = ranked.subquery()
+
+        query = (
+            select(ranked.c.date, ranked.c.name)
+            .where(ranked.c.rank <= limit)
+            .order_by(ranked.c.date, ranked.c.rank)
+        )
+
+        result = await self.db.execute(query)
+        topics: Dict[str, List[str]] = {}
+        for row in result.all():
+            if row.date is not None:
+                topics.setdefault(str(row.date), []).append(row.name)
+
+        return topics
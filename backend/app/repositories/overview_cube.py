@@ -0,0 +1,168 @@
+"""In-memory daily aggregates for the dashboard overview."""
+
+from datetime import datetime, date, timedelta
+from typing import Dict, List, Optional, Any, Union
+
+
+SENTIMENT_KEYS = {
+    "позитив": "positive",
+    "нейтральный": "neutral",
+    "негатив": "negative",
+}
+
+
+def _day_key(value: Union[datetime, date]) -> str:
+    """Convert datetime/date to the YYYY-MM-DD key used by the cube.
+
+    Args:
+        value: datetime or date value
+
+    Returns:
+        ISO date string (matches SQLite date() output)
+    """
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.isoformat()
+
+
+class OverviewCube:
+    """Daily aggregates for one filter combination.
+
+    Built by DashboardRepository.get_overview_cube from a single grouped
+    scan. Slicing methods return the same shapes as the corresponding
+    DashboardRepository queries, so the service can use them directly.
+
+    Attributes:
+        days: Mapping of YYYY-MM-DD to day aggregates with keys
+            total_reviews, positive, neutral, negative, total
+        topics: Mapping of YYYY-MM-DD to category names ordered by
+            mention count (descending)
+    """
+
+    def __init__(
+        self,
+        days: Dict[str, Dict[str, int]],
+        topics: Optional[Dict[str, List[str]]] = None,
+    ):
+        """Initialize cube with pre-aggregated data.
+
+        Args:
+            days: Day aggregates keyed by YYYY-MM-DD
+            topics: Ranked category names keyed by YYYY-MM-DD
+        """
+        self.days = days
+        self.topics = topics or {}
+
+    def _days_between(self, from_date: Union[datetime, date], to_date: Union[datetime, date]) -> List[str]:
+        """Get sorted day keys within [from_date, to_date].
+
+        Args:
+            from_date: Start date (inclusive)
+            to_date: End date (inclusive)
+
+        Returns:
+            Sorted list of day keys present in the cube
+        """
+        start, end = _day_key(from_date), _day_key(to_date)
+        return sorted(day for day in self.days if start <= day <= end)
+
+    def get_review_metrics(
+        self, from_date: Union[datetime, date], to_date: Union[datetime, date]
+    ) -> Dict[str, int]:
+        """Sum day aggregates for a period.
+
+        Args:
+            from_date: Start date (inclusive)
+            to_date: End date (inclusive)
+
+        Returns:
+            Dictionary with total_reviews, positive, neutral, negative
+
+        Note:
+            Summing per-day distinct review counts is exact because every
+            review belongs to exactly one day.
+        """
+        metrics = {"total_reviews": 0, "positive": 0, "neutral": 0, "negative": 0}
+        for day in self._days_between(from_date, to_date):
+            for key in metrics:
+                metrics[key] += self.days[day][key]
+        return metrics
+
+    def get_sparkline_data(
+        self,
+        to_date: Union[datetime, date],
+        days: int = 7,
+        sentiment_name: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get daily values for the last N days.
+
+        Args:
+            to_date: End date (inclusive)
+            days: Number of days to retrieve (default: 7)
+            sentiment_name: Sentiment name in DB format, or None for
+                unique review counts
+
+        Returns:
+            List of dicts with 'date' and 'value' keys, sorted by date
+
+        Note:
+            Days without matching annotations are omitted, exactly like
+            the GROUP BY queries this replaces.
+        """
+        from_date = to_date - timedelta(days=days - 1)
+        key = SENTIMENT_KEYS[sentiment_name] if sentiment_name else "total_reviews"
+
+        points = []
+        for day in self._days_between(from_date, to_date):
+            value = self.days[day][key]
+            if value:
+                points.append({"date": day, "value": value})
+        return points
+
+    def get_sentiment_dynamics(
+        self, from_date: Union[datetime, date], to_date: Union[datetime, date]
+    ) -> List[Dict[str, Any]]:
+        """Get daily sentiment distribution (percentages).
+
+        Args:
+            from_date: Start date (inclusive)
+            to_date: End date (inclusive)
+
+        Returns:
+            List of dicts with date, positive, neutral, negative keys
+
+        Note:
+            Percentages are rounded to integers.
+        """
+        dynamics = []
+        for day in self._days_between(from_date, to_date):
+            row = self.days[day]
+            total = row["total"]
+            if total > 0:
+                positive_pct = round((row["positive"] / total) * 100)
+                neutral_pct = round((row["neutral"] / total) * 100)
+                negative_pct = round((row["negative"] / total) * 100)
+            else:
+                positive_pct = neutral_pct = negative_pct = 0
+
+            dynamics.append({
+                "date": day,
+                "positive": positive_pct,
+                "neutral": neutral_pct,
+                "negative": negative_pct,
+            })
+
+        return dynamics
+
+    def get_top_topics(self, target_date: Union[datetime, date, str], limit: int = 3) -> List[str]:
+        """Get top N categories for a specific date.
+
+        Args:
+            target_date: Target date or YYYY-MM-DD key
+            limit: Number of top topics to return (default: 3)
+
+        Returns:
+            List of category names (max 'limit' items)
+        """
+        day = target_date if isinstance(target_date, str) else _day_key(target_date)
+        return self.topics.get(day, [])[:limit]
@@ -1,9 +1,10 @@
 """Service layer for dashboard business logic."""
 
-from datetime import datetime, date
+from datetime import datetime, timedelta
 from typing import List, Dict
 
 from app.repositories.dashboard_repository import DashboardRepository
+from app.repositories.overview_cube import OverviewCube
 from app.services.aggregation_service import AggregationService
 from app.schemas.filters import OverviewRequest, DateRangeSchema, FiltersSchema
 from app.schemas.dashboard import (
@@ -18,6 +19,9 @@ from app.core.mappings import (
     get_db_source_names,
 )
 
+# Number of days in metric sparklines
+SPARKLINE_DAYS = 7
+
 
 class DashboardService:
     """Service for dashboard overview data.
@@ -40,10 +44,10 @@ class DashboardService:
 
         This is the main method that coordinates:
         1. Filter transformation (API → DB format)
-        2. Metrics retrieval for current and previous periods
-        3. Trend calculations
+        2. Daily aggregates retrieval (one OverviewCube per request)
+        3. Metrics for current and previous periods with trends
         4. Sparkline data generation
-        5. Sentiment dynamics retrieval with top topics
+        5. Sentiment dynamics with top topics
 
         Args:
             request: OverviewRequest with date_range and filters
@@ -55,40 +59,44 @@ class DashboardService:
         db_sources = get_db_source_names(request.filters.sources)
         db_categories = get_categories_for_products(request.filters.products)
 
-        # Get current period metrics
-        current_metrics = await self.repository.get_review_metrics(
-            from_date=request.date_range.from_,
+        # Previous period for trend calculation
+        prev_from, prev_to = self.aggregation.get_previous_period_dates(
+            request.date_range
+        )
+
+        # One scan covers previous period, current period and sparklines
+        sparkline_from = request.date_range.to - timedelta(days=SPARKLINE_DAYS - 1)
+        cube = await self.repository.get_overview_cube(
+            from_date=min(prev_from, sparkline_from),
             to_date=request.date_range.to,
             source_names=db_sources if db_sources else None,
             category_names=db_categories if db_categories else None,
+            topics_from_date=request.date_range.from_,
         )
 
-        # Get previous period metrics for trend calculation
-        prev_from, prev_to = self.aggregation.get_previous_period_dates(
-            request.date_range
+        # Current and previous period metrics
+        current_metrics = cube.get_review_metrics(
+            from_date=request.date_range.from_,
+            to_date=request.date_range.to,
         )
-        previous_metrics = await self.repository.get_review_metrics(
+        previous_metrics = cube.get_review_metrics(
             from_date=prev_from,
             to_date=prev_to,
-            source_names=db_sources if db_sources else None,
-            category_names=db_categories if db_categories else None,
         )
 
         # Build metrics with trends and sparklines
-        metrics = await self._build_metrics(
+        metrics = self._build_metrics(
+            cube=cube,
             current=current_metrics,
             previous=previous_metrics,
             to_date=request.date_range.to,
-            db_sources=db_sources if db_sources else None,
-            db_categories=db_categories if db_categories else None,
         )
 
         # Get sentiment dynamics with topics
-        sentiment_dynamics = await self._build_sentiment_dynamics(
+        sentiment_dynamics = self._build_sentiment_dynamics(
+            cube=cube,
             from_date=request.date_range.from_,
             to_date=request.date_range.to,
-            db_sources=db_sources if db_sources else None,
-            db_categories=db_categories if db_categories else None,
         )
 
         # Build metadata
@@ -104,22 +112,20 @@ class DashboardService:
             sentiment_dynamics=sentiment_dynamics,
         )
 
-    async def _build_metrics(
+    def _build_metrics(
         self,
+        cube: OverviewCube,
         current: Dict[str, int],
         previous: Dict[str, int],
         to_date: datetime,
-        db_sources: List[str] = None,
-        db_categories: List[str] = None,
     ) -> MetricsSchema:
         """Build all metrics with trends and sparklines.
 
         Args:
+            cube: Daily aggregates for the requested filters
             current: Current period metrics
             previous: Previous period metrics
             to_date: End date for sparkline calculation
-            db_sources: Database source names (or None for all)
-            db_categories: Database category names (or None for all)
 
         Returns:
             MetricsSchema with all four metrics
@@ -128,44 +134,40 @@ class DashboardService:
         total_annotations = current["positive"] + current["neutral"] + current["negative"]
 
         # Total reviews
-        total_reviews = await self._build_metric(
+        total_reviews = self._build_metric(
+            cube=cube,
             current_value=current["total_reviews"],
             previous_value=previous["total_reviews"],
             to_date=to_date,
-            db_sources=db_sources,
-            db_categories=db_categories,
             include_percentage=False,
         )
 
         # Positive reviews
-        positive_reviews = await self._build_metric(
+        positive_reviews = self._build_metric(
+            cube=cube,
             current_value=current["positive"],
             previous_value=previous["positive"],
             to_date=to_date,
-            db_sources=db_sources,
-            db_categories=db_categories,
             total_for_percentage=total_annotations,
             sentiment_name="позитив",
         )
 
         # Neutral reviews
-        neutral_reviews = await self._build_metric(
+        neutral_reviews = self._build_metric(
+            cube=cube,
             current_value=current["neutral"],
             previous_value=previous["neutral"],
             to_date=to_date,
-            db_sources=db_sources,
-            db_categories=db_categories,
             total_for_percentage=total_annotations,
             sentiment_name="нейтральный",
         )
 
         # Negative reviews
-        negative_reviews = await self._build_metric(
+        negative_reviews = self._build_metric(
+            cube=cube,
             current_value=current["negative"],
             previous_value=previous["negative"],
             to_date=to_date,
-            db_sources=db_sources,
-            db_categories=db_categories,
             total_for_percentage=total_annotations,
             sentiment_name="негатив",
         )
@@ -177,13 +179,12 @@ class DashboardService:
             negative_reviews=negative_reviews,
         )
 
-    async def _build_metric(
+    def _build_metric(
         self,
+        cube: OverviewCube,
         current_value: int,
         previous_value: int,
         to_date: datetime,
-        db_sources: List[str] = None,
-        db_categories: List[str] = None,
         include_percentage: bool = True,
         total_for_percentage: int = None,
         sentiment_name: str = None,
@@ -191,11 +192,10 @@ class DashboardService:
         """Build a single metric with trend and sparkline.
 
         Args:
+            cube: Daily aggregates for the requested filters
             current_value: Current period value
             previous_value: Previous period value
             to_date: End date for sparkline
-            db_sources: Database source names (or None for all)
-            db_categories: Database category names (or None for all)
             include_percentage: Whether to include percentage field
             total_for_percentage: Total value for percentage calculation
             sentiment_name: Sentiment name for sparkline (if applicable)
@@ -206,26 +206,15 @@ class DashboardService:
         # Calculate trend
         trend = self.aggregation.calculate_trend(current_value, previous_value)
 
-        # Get sparkline data
-        if sentiment_name:
-            # For sentiment metrics, get annotation counts by sentiment
-            sparkline_data = await self.repository.get_sparkline_by_sentiment(
-                to_date=to_date,
-                sentiment_name=sentiment_name,
-                days=7,
-                source_names=db_sources,
-                category_names=db_categories,
-            )
-        else:
-            # For total reviews, get unique review counts
-            sparkline_data = await self.repository.get_sparkline_data(
-                to_date=to_date,
-                days=7,
-                source_names=db_sources,
-                category_names=db_categories,
-            )
+        # Get sparkline data: annotation counts by sentiment for sentiment
+        # metrics, unique review counts for total reviews
+        sparkline_data = cube.get_sparkline_data(
+            to_date=to_date,
+            days=SPARKLINE_DAYS,
+            sentiment_name=sentiment_name,
+        )
 
-        sparkline = self.aggregation.format_sparkline(sparkline_data, days=7)
+        sparkline = self.aggregation.format_sparkline(sparkline_data, days=SPARKLINE_DAYS)
 
         # Calculate percentage if needed
         percentage = None
@@ -241,45 +230,32 @@ class DashboardService:
             sparkline=sparkline,
         )
 
-    async def _build_sentiment_dynamics(
+    def _build_sentiment_dynamics(
         self,
+        cube: OverviewCube,
         from_date: datetime,
         to_date: datetime,
-        db_sources: List[str] = None,
-        db_categories: List[str] = None,
     ) -> List[SentimentDynamicsSchema]:
         """Build sentiment dynamics with top topics for each day.
 
         Args:
+            cube: Daily aggregates for the requested filters
             from_date: Start date
             to_date: End date
-            db_sources: Database source names (or None for all)
-            db_categories: Database category names (or None for all)
 
         Returns:
             List of SentimentDynamicsSchema instances
         """
         # Get sentiment dynamics (percentages by day)
-        dynamics_data = await self.repository.get_sentiment_dynamics(
+        dynamics_data = cube.get_sentiment_dynamics(
             from_date=from_date,
             to_date=to_date,
-            source_names=db_sources,
-            category_names=db_categories,
         )
 
-        # For each day, get top-3 topics
         dynamics = []
         for day_data in dynamics_data:
-            # Parse date string to date object
-            day_date = datetime.strptime(day_data["date"], "%Y-%m-%d").date()
-
             # Get top-3 topics for this day
-            topics = await self.repository.get_top_topics_for_date(
-                target_date=day_date,
-                source_names=db_sources,
-                category_names=db_categories,
-                limit=3,
-            )
+            topics = cube.get_top_topics(day_data["date"], limit=3)
 
             # Normalize percentages to ensure they sum to 100
             positive, neutral, negative = self.aggregation.normalize_percentages(
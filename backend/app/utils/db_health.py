@@ -1,9 +1,13 @@
 """Database health check utilities."""
+from datetime import datetime, timedelta
 from typing import Dict, List, Any
-from sqlalchemy import text, inspect
+from sqlalchemy import event, text, inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.logging import logger
+from app.core.mappings import PRODUCT_TO_CATEGORY_MAPPING, SOURCE_API_TO_DB
+from app.repositories.dashboard_repository import DashboardRepository
 
 
 REQUIRED_TABLES = [
@@ -21,6 +25,15 @@ OPTIONAL_VIEWS = [
     "source_comparison",
 ]
 
+# Tables where a full scan means a missing index.
+# Reference tables (sources, categories, sentiments) are tiny and not checked.
+INDEXED_TABLES = [
+    "reviews",
+    "annotations",
+    "daily_sentiment_rollup",
+    "daily_review_rollup",
+]
+
 
 async def check_database_health(db: AsyncSession) -> Dict[str, Any]:
     """Perform comprehensive database health check.
@@ -256,3 +269,151 @@ async def get_database_stats(db: AsyncSession) -> Dict[str, Any]:
         stats["error"] = str(e)
 
     return stats
+
+
+async def analyze_query_plans(db: AsyncSession) -> Dict[str, Any]:
+    """Run EXPLAIN QUERY PLAN for every DashboardRepository query.
+
+    Each repository method is executed once without filters and once with
+    source and category filters. Statements are captured at cursor level,
+    so the plans match exactly what the repository sends to SQLite.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Dictionary with query plan report:
+        - checked_queries: int - Number of explained statements
+        - full_scans: List[dict] - Full-table scans on INDEXED_TABLES
+        - plans: Dict[str, List[str]] - Plan details by query name
+        - error: str - Error message if any
+
+    Note:
+        Skipped (empty report) on non-SQLite backends.
+
+    Example:
+        {
+            "checked_queries": 16,
+            "full_scans": [
+                {
+                    "query": "get_review_metrics",
+                    "table": "annotations",
+                    "detail": "SCAN annotations"
+                }
+            ],
+            "plans": {
+                "get_review_metrics": [
+                    "SEARCH reviews USING COVERING INDEX ix_reviews_date_source (date>? AND date<?)",
+                    ...
+                ]
+            }
+        }
+    """
+    report = {
+        "checked_queries": 0,
+        "full_scans": [],
+        "plans": {},
+        "error": None,
+    }
+
+    if db.bind is not None and db.bind.dialect.name != "sqlite":
+        # EXPLAIN QUERY PLAN output is SQLite-specific
+        logger.info("query_plan_analysis_skipped", backend=db.bind.dialect.name)
+        return report
+
+    repository = DashboardRepository(db, use_rollup=settings.DASHBOARD_USE_ROLLUP)
+    to_date = datetime.utcnow()
+    from_date = to_date - timedelta(days=30)
+    sources = list(SOURCE_API_TO_DB.values())[:1]
+    categories = next(iter(PRODUCT_TO_CATEGORY_MAPPING.values()))
+
+    calls = {}
+    for suffix, filters in (
+        ("", {}),
+        ("[filtered]", {"source_names": sources, "category_names": categories}),
+    ):
+        calls.update({
+            f"get_review_metrics{suffix}": lambda f=filters: repository.get_review_metrics(
+                from_date, to_date, **f
+            ),
+            f"get_sparkline_data{suffix}": lambda f=filters: repository.get_sparkline_data(
+                to_date, **f
+            ),
+            f"get_sparkline_by_sentiment{suffix}": lambda f=filters: repository.get_sparkline_by_sentiment(
+                to_date, "позитив", **f
+            ),
+            f"get_sentiment_dynamics{suffix}": lambda f=filters: repository.get_sentiment_dynamics(
+                from_date, to_date, **f
+            ),
+            f"get_top_topics_for_date{suffix}": lambda f=filters: repository.get_top_topics_for_date(
+                to_date.date(), **f
+            ),
+            f"get_top_topics_for_range{suffix}": lambda f=filters: repository.get_top_topics_for_range(
+                from_date, to_date, **f
+            ),
+            f"get_overview_cube{suffix}": lambda f=filters: repository.get_overview_cube(
+                from_date, to_date, **f
+            ),
+        })
+
+    try:
+        conn = await db.connection()
+
+        for name, call in calls.items():
+            statements = []
+
+            def _capture(conn, cursor, statement, parameters, context, executemany):
+                statements.append((statement, parameters))
+
+            event.listen(conn.sync_connection, "before_cursor_execute", _capture)
+            try:
+                await call()
+            finally:
+                event.remove(conn.sync_connection, "before_cursor_execute", _capture)
+
+            for number, (statement, parameters) in enumerate(statements):
+                query_name = name if len(statements) == 1 else f"{name}#{number + 1}"
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                )
+                details = [row[3] for row in result.all()]
+                report["plans"][query_name] = details
+                report["checked_queries"] += 1
+
+                for detail in details:
+                    # "SCAN reviews" is a full-table scan,
+                    # "SCAN reviews USING [COVERING] INDEX ..." is not
+                    words = detail.split()
+                    if (
+                        len(words) >= 2
+                        and words[0] == "SCAN"
+                        and words[1] in INDEXED_TABLES
+                        and "USING" not in words
+                    ):
+                        report["full_scans"].append({
+                            "query": query_name,
+                            "table": words[1],
+                            "detail": detail,
+                        })
+
+        if report["full_scans"]:
+            logger.warning(
+                "query_plan_full_scans_detected",
+                full_scans=report["full_scans"],
+            )
+        else:
+            logger.info(
+                "query_plan_analysis_passed",
+                checked_queries=report["checked_queries"],
+            )
+
+    except Exception as e:
+        logger.error(
+            "query_plan_analysis_error",
+            error=str(e),
+            error_type=type(e).__name__,
+            exc_info=True,
+        )
+        report["error"] = str(e)
+
+    return report
@@ -0,0 +1,115 @@
+"""Benchmark dashboard overview reads: default engine vs mmap reader mode.
+
+Runs DashboardService.get_overview against two engines built from the
+same DATABASE_URL:
+
+- baseline: plain create_async_engine(DATABASE_URL), no PRAGMAs
+- reader:   the reader engine with SQLITE_READER_MODE enabled
+            (mode=ro URI, query_only, large mmap_size)
+
+Usage (from backend/):
+    python scripts/benchmark_reader.py --requests 500 --concurrency 8
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db import session as db_session  # noqa: E402
+from app.repositories.dashboard_repository import DashboardRepository  # noqa: E402
+from app.schemas.filters import OverviewRequest  # noqa: E402
+from app.services.dashboard_service import DashboardService  # noqa: E402
+
+REQUESTS = [
+    OverviewRequest.model_validate({
+        "date_range": {"from": "2025-01-01T00:00:00Z", "to": "2025-05-31T23:59:59Z"},
+    }),
+    OverviewRequest.model_validate({
+        "date_range": {"from": "2025-03-01T00:00:00Z", "to": "2025-05-31T23:59:59Z"},
+        "filters": {"sources": ["banki-ru"], "products": ["mobile-app", "deposits"]},
+    }),
+]
+
+
+async def run(factory: async_sessionmaker, total: int, concurrency: int) -> list:
+    """Run overview requests and collect per-request latencies.
+
+    Args:
+        factory: Session factory bound to the engine under test
+        total: Number of requests
+        concurrency: Number of concurrent workers
+
+    Returns:
+        List of latencies in milliseconds
+    """
+    latencies = []
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        for i in counter:
+            started = time.perf_counter()
+            async with factory() as session:
+                service = DashboardService(
+                    DashboardRepository(session, use_rollup=settings.DASHBOARD_USE_ROLLUP)
+                )
+                await service.get_overview(REQUESTS[i % len(REQUESTS)])
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def report(name: str, latencies: list, elapsed: float) -> None:
+    """Print latency summary.
+
+    Args:
+        name: Engine name
+        latencies: Latencies in milliseconds
+        elapsed: Wall time in seconds
+    """
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{name:<10} req/s={len(latencies) / elapsed:8.1f}  "
+        f"mean={statistics.mean(latencies):7.2f}ms  "
+        f"p50={statistics.median(latencies):7.2f}ms  p95={p95:7.2f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=20)
+    args = parser.parse_args()
+
+    baseline = create_async_engine(settings.DATABASE_URL)
+
+    settings.SQLITE_READER_MODE = True
+    reader = db_session._create_engine(read_only=True)
+
+    print(f"database: {settings.DATABASE_URL}")
+    print(f"reader:   {db_session._reader_url()}")
+
+    for name, engine in (("baseline", baseline), ("reader", reader)):
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        await run(factory, args.warmup, 1)
+
+        started = time.perf_counter()
+        latencies = await run(factory, args.requests, args.concurrency)
+        report(name, latencies, time.perf_counter() - started)
+
+        await engine.dispose()
+
+    await db_session.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,222 @@
+"""Load bank_reviews.db into PostgreSQL and check DashboardRepository parity.
+
+Every DashboardRepository query is run against both databases for several
+periods and filter combinations; results must be identical.
+
+Usage (from backend/):
+    # Copy data into an empty (throwaway) PostgreSQL database, then compare
+    python scripts/postgres_parity.py --load \\
+        --postgres postgresql+asyncpg://postgres@localhost:5432/bank_reviews
+
+    # Compare only; the PostgreSQL URL can also come from DATABASE_URL
+    DATABASE_URL=postgresql+asyncpg://postgres@localhost:5432/bank_reviews \\
+        python scripts/postgres_parity.py
+
+Exit code is 1 if any query differs.
+"""
+import argparse
+import asyncio
+import os
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine  # noqa: E402
+
+from app.core.mappings import PRODUCT_TO_CATEGORY_MAPPING, SOURCE_API_TO_DB  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.models import Annotation, Category, Review, Sentiment, Source  # noqa: E402
+from app.repositories.dashboard_repository import DashboardRepository  # noqa: E402
+
+SQLITE_URL = "sqlite+aiosqlite:///./database/bank_reviews.db"
+
+# Parent tables first (foreign keys)
+TABLES = [Source, Category, Sentiment, Review, Annotation]
+
+PERIODS = [
+    (datetime(2025, 1, 1), datetime(2025, 1, 31, 23, 59, 59)),
+    (datetime(2025, 3, 1), datetime(2025, 5, 31, 23, 59, 59)),
+    (datetime(2024, 1, 1), datetime(2025, 12, 31, 23, 59, 59)),
+]
+
+FILTERS = [
+    {},
+    {"source_names": [SOURCE_API_TO_DB["banki-ru"]]},
+    {"category_names": PRODUCT_TO_CATEGORY_MAPPING["support"]},
+    {
+        "source_names": [SOURCE_API_TO_DB["sravni-ru"]],
+        "category_names": PRODUCT_TO_CATEGORY_MAPPING["credit-cards"],
+    },
+]
+
+
+def _parse_row(table, row: dict) -> dict:
+    """Convert SQLite text values to Python types for the PostgreSQL insert.
+
+    Args:
+        table: Model class
+        row: Row read from SQLite
+
+    Returns:
+        Row with date and created_at parsed
+
+    Raises:
+        ValueError: If reviews.date is not YYYY-MM-DD
+    """
+    row = dict(row)
+    if table is Review:
+        row["date"] = date.fromisoformat(row["date"])
+    if row.get("created_at"):
+        row["created_at"] = datetime.fromisoformat(row["created_at"])
+    return row
+
+
+async def load(sqlite: AsyncEngine, postgres: AsyncEngine) -> None:
+    """Recreate the schema in PostgreSQL and copy all rows from SQLite.
+
+    Args:
+        sqlite: Source engine
+        postgres: Target engine (existing tables are dropped)
+
+    Note:
+        Reviews with a malformed date cannot be stored in a DATE column
+        and are skipped together with their annotations. SQLite queries
+        never match them either (date() returns NULL). Annotations of
+        missing reviews (SQLite does not enforce foreign keys) are
+        skipped as well; they never join to a review.
+    """
+    tables = [model.__table__ for model in TABLES]
+
+    async with postgres.begin() as conn:
+        await conn.run_sync(lambda c: Base.metadata.drop_all(c, tables=tables))
+        await conn.run_sync(lambda c: Base.metadata.create_all(c, tables=tables))
+
+    loaded_reviews = set()
+    async with sqlite.connect() as src, postgres.begin() as dst:
+        for model in TABLES:
+            table = model.__table__
+            columns = ", ".join(column.name for column in table.columns)
+            result = await src.execute(text(f"SELECT {columns} FROM {table.name}"))
+
+            rows, skipped = [], 0
+            for row in result.mappings():
+                if model is Annotation and row["review_id"] not in loaded_reviews:
+                    skipped += 1
+                    continue
+                try:
+                    rows.append(_parse_row(model, row))
+                except ValueError:
+                    skipped += 1
+                    print(f"skipped review {row['review_id']}: date={row['date']!r}")
+                    continue
+                if model is Review:
+                    loaded_reviews.add(row["review_id"])
+
+            if rows:
+                await dst.execute(table.insert(), rows)
+
+            # Explicit ids were inserted, move sequences past them
+            primary_key = table.primary_key.columns.values()[0].name
+            await dst.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', '{primary_key}'), "
+                f"COALESCE(MAX({primary_key}), 0) + 1, false) FROM {table.name}"
+            ))
+            print(f"{table.name}: {len(rows)} rows, {skipped} skipped")
+
+
+def _calls(repository: DashboardRepository) -> dict:
+    """Get every DashboardRepository query for all periods and filters.
+
+    Args:
+        repository: Repository bound to one of the databases
+
+    Returns:
+        Mapping of call description to coroutine factory
+    """
+    calls = {}
+    for from_date, to_date in PERIODS:
+        for filters in FILTERS:
+            key = f"{from_date.date()}..{to_date.date()} {filters}"
+            calls.update({
+                f"get_review_metrics {key}": lambda a=from_date, b=to_date, f=filters: repository.get_review_metrics(a, b, **f),
+                f"get_sparkline_data {key}": lambda b=to_date, f=filters: repository.get_sparkline_data(b, days=30, **f),
+                f"get_sparkline_by_sentiment {key}": lambda b=to_date, f=filters: repository.get_sparkline_by_sentiment(b, "негатив", days=30, **f),
+                f"get_sentiment_dynamics {key}": lambda a=from_date, b=to_date, f=filters: repository.get_sentiment_dynamics(a, b, **f),
+                f"get_top_topics_for_date {key}": lambda b=to_date, f=filters: repository.get_top_topics_for_date(b.date(), **f),
+                f"get_top_topics_for_range {key}": lambda a=from_date, b=to_date, f=filters: repository.get_top_topics_for_range(a, b, **f),
+                f"get_overview_cube {key}": lambda a=from_date, b=to_date, f=filters: repository.get_overview_cube(a, b, **f),
+            })
+    return calls
+
+
+def _normalize(value):
+    """Make query results comparable (OverviewCube → dict).
+
+    Args:
+        value: Repository result
+
+    Returns:
+        Plain data structure
+    """
+    if hasattr(value, "days") and hasattr(value, "topics"):
+        return {"days": value.days, "topics": value.topics}
+    return value
+
+
+async def compare(sqlite: AsyncEngine, postgres: AsyncEngine) -> int:
+    """Run every query on both databases and report differences.
+
+    Args:
+        sqlite: SQLite engine
+        postgres: PostgreSQL engine
+
+    Returns:
+        Number of differing queries
+    """
+    async with AsyncSession(sqlite) as sqlite_db, AsyncSession(postgres) as postgres_db:
+        expected_calls = _calls(DashboardRepository(sqlite_db))
+        actual_calls = _calls(DashboardRepository(postgres_db))
+
+        mismatches = 0
+        for name, call in expected_calls.items():
+            expected = _normalize(await call())
+            actual = _normalize(await actual_calls[name]())
+            if expected != actual:
+                mismatches += 1
+                print(f"MISMATCH {name}\n  sqlite:   {expected}\n  postgres: {actual}")
+
+    print(f"{len(expected_calls) - mismatches}/{len(expected_calls)} queries identical")
+    return mismatches
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sqlite", default=SQLITE_URL)
+    parser.add_argument(
+        "--postgres",
+        default=os.getenv("DATABASE_URL"),
+        help="postgresql+asyncpg:// URL (default: DATABASE_URL)",
+    )
+    parser.add_argument("--load", action="store_true", help="copy data before comparing")
+    args = parser.parse_args()
+    if not args.postgres or not args.postgres.startswith("postgresql+asyncpg://"):
+        parser.error("--postgres or DATABASE_URL must be a postgresql+asyncpg:// URL")
+
+    sqlite = create_async_engine(args.sqlite)
+    postgres = create_async_engine(args.postgres)
+    try:
+        if args.load:
+            await load(sqlite, postgres)
+        mismatches = await compare(sqlite, postgres)
+    finally:
+        await sqlite.dispose()
+        await postgres.dispose()
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,12 +1,19 @@
 import pandas as pd
 import json
+import multiprocessing
 import os
+import sys
 import requests
-from typing import List, Dict, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Dict, Optional, Tuple
 from pathlib import Path
 
 from llama_cpp import Llama
 
+# общий с API разбор JSON из ответа модели
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "api"))
+from utils.json_extract import extract_json  # noqa: E402
+
 
 def download_model(url: str, model_path: str) -> bool:
     """
@@ -77,18 +84,21 @@ class LLMLocal:
         self,
         messages: list,
         max_new_tokens: int = 256,
-        temperature: float = 0.1
+        temperature: float = 0.1,
+        json_schema: Optional[dict] = None
     ) -> str:
+        """
+        Генерирует ответ модели.
+        С json_schema - генерация ограничена грамматикой llama.cpp по схеме:
+        модель может выдать только JSON этой схемы и останавливается,
+        как только JSON закрыт.
+        """
+        kwargs = {}
+        if json_schema is not None:
+            kwargs["response_format"] = {"type": "json_object", "schema": json_schema}
+
         try:
-            if self.use_system_role:
-                output = self.llm.create_chat_completion(
-                    messages=messages,
-                    max_tokens=max_new_tokens,
-                    temperature=temperature,
-                    top_p=0.9,
-                )
-                return output["choices"][0]["message"]["content"].strip()
-            else:
+            if not self.use_system_role:
                 # Склеиваем system + user в один user-запрос
                 full_content = ""
                 for msg in messages:
@@ -96,13 +106,16 @@ class LLMLocal:
                         full_content += f"{msg['content']}\n\n"
                     elif msg["role"] == "user":
                         full_content += f"Отзыв:\n{msg['content']}"
-                output = self.llm.create_chat_completion(
-                    messages=[{"role": "user", "content": full_content}],
-                    max_tokens=max_new_tokens,
-                    temperature=temperature,
-                    top_p=0.9,
-                )
-                return output["choices"][0]["message"]["content"].strip()
+                messages = [{"role": "user", "content": full_content}]
+
+            output = self.llm.create_chat_completion(
+                messages=messages,
+                max_tokens=max_new_tokens,
+                temperature=temperature,
+                top_p=0.9,
+                **kwargs
+            )
+            return output["choices"][0]["message"]["content"].strip()
         except Exception as e:
             print(f"❌ Ошибка при генерации: {e}")
             return ""
@@ -114,11 +127,37 @@ class LLMClassifier:
         self,
         llm,
         categories: List[str],
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        sentiments: Optional[List[str]] = None,
+        constrained: bool = True
     ):
         self.llm = llm
         self.categories = [cat.strip() for cat in categories]
+        self.sentiments = sentiments or ["позитив", "негатив", "нейтрально"]
         self.default_system_prompt = system_prompt or self._default_prompt()
+        # constrained=True - ответ ограничен JSON схемой (грамматика llama.cpp):
+        # только категории из списка и тональности из sentiments, без текста вокруг JSON
+        self.response_schema = self._response_schema() if constrained else None
+
+    def _response_schema(self) -> dict:
+        return {
+            "type": "object",
+            "properties": {
+                "annotations": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "category": {"type": "string", "enum": self.categories},
+                            "summary": {"type": "string"},
+                            "sentiment": {"type": "string", "enum": self.sentiments},
+                        },
+                        "required": ["category", "summary", "sentiment"],
+                    },
+                },
+            },
+            "required": ["annotations"],
+        }
 
     def _default_prompt(self) -> str:
         cats = ", ".join([f'"{cat}"' for cat in self.categories])
@@ -132,7 +171,7 @@ class LLMClassifier:
     {{
       "category": "...",
       "summary": "...",
-      "sentiment": "позитив|негатив|нейтрально"
+      "sentiment": "{"|".join(self.sentiments)}"
     }}
   ]
 }}
@@ -155,22 +194,21 @@ class LLMClassifier:
         raw_response = self.llm.answer(
             messages=messages,
             max_new_tokens=max_new_tokens,
-            temperature=temperature
+            temperature=temperature,
+            json_schema=self.response_schema
         )
 
         return self._clean_json(raw_response)
 
     def _clean_json(self, text: str) -> dict:
         try:
-            start = text.find("{")
-            end = text.rfind("}") + 1
-            if start == -1 or end == 0:
-                return {"annotations": []}
-            cleaned = text[start:end]
-            return json.loads(cleaned)
-        except json.JSONDecodeError as e:
+            parsed = extract_json(text)
+        except ValueError as e:
             print(f"⚠️ Ошибка парсинга JSON: {e} | Текст: {text[:300]}...")
             return {"annotations": []}
+        if not isinstance(parsed, dict):
+            return {"annotations": []}
+        return parsed
 
 
 import random
@@ -220,12 +258,133 @@ def csv_read(filepath: str, nrows: Optional[int] = None) -> pd.DataFrame:
         raise ValueError(f"CSV должен содержать: {required}")
     return df
 
+# === Параллельная обработка: свой экземпляр модели в каждом процессе ===
+_worker_classifier: Optional[LLMClassifier] = None
+
+
+def detect_gpu_layers() -> int:
+    """
+    Сколько слоёв модели выгружать на GPU: GPU_LAYERS, если доступна CUDA, иначе 0.
+    Вызывается в отдельном (spawn) процессе, чтобы CUDA не инициализировалась в родителе.
+    """
+    try:
+        import torch
+        gpu_available = torch.cuda.is_available()
+        print(f"🖥️ GPU доступен: {gpu_available}")
+    except ImportError:
+        gpu_available = False
+        print("🖥️ GPU не обнаружен, используем CPU")
+    return GPU_LAYERS if gpu_available else 0
+
+
+def _init_worker(llm_kwargs: dict, classifier_kwargs: dict):
+    global _worker_classifier
+    _worker_classifier = LLMClassifier(LLMLocal(**llm_kwargs), **classifier_kwargs)
+
+
+def _classify_row(row: Tuple[int, str]) -> dict:
+    review_id, text = row
+    annotation = _worker_classifier.classify(text)
+    return {"id": review_id, "annotations": annotation.get("annotations", [])}
+
+
+def classify_rows(
+    rows: List[Tuple[int, str]],
+    llm_kwargs: dict,
+    classifier_kwargs: dict,
+    n_workers: int = 1
+) -> Iterator[dict]:
+    """
+    Классифицирует отзывы (id, текст) и отдаёт результаты в порядке rows.
+
+    n_workers > 1 - пул процессов, в каждом свой Llama с llm_kwargs["n_threads"] потоками
+    (n_workers * n_threads ~ число ядер). Экземпляр Llama обрабатывает один отзыв за раз,
+    поэтому параллельность - только за счёт нескольких процессов.
+    llm_kwargs["n_gpu_layers"] = None - определить автоматически (detect_gpu_layers).
+    С GPU работает один процесс: у каждого процесса своя копия весов в VRAM.
+    """
+    if not rows:
+        return
+
+    # процессы запускаются через spawn: fork после инициализации CUDA/llama.cpp небезопасен
+    context = multiprocessing.get_context("spawn")
+    if llm_kwargs.get("n_gpu_layers") is None:
+        with context.Pool(1) as probe:
+            llm_kwargs = {**llm_kwargs, "n_gpu_layers": probe.apply(detect_gpu_layers)}
+    if llm_kwargs["n_gpu_layers"] > 0 and n_workers > 1:
+        print(f"⚠️ Модель на GPU: вместо {n_workers} процессов используем один")
+        n_workers = 1
+    print(f"🚀 Процессов: {n_workers}, потоков на процесс: {llm_kwargs.get('n_threads')}")
+
+    if n_workers <= 1:
+        _init_worker(llm_kwargs, classifier_kwargs)
+        for row in rows:
+            yield _classify_row(row)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(llm_kwargs, classifier_kwargs)
+    ) as executor:
+        yield from executor.map(_classify_row, rows, chunksize=4)
+
+
 def save_checkpoint(data: List[dict], filename: str):
+    """Сохраняет все результаты одним JSON файлом (прежний формат, для компакции)."""
     with open(filename, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
     print(f"💾 Чекпоинт сохранён: {filename}")
 
 
+class JsonlCheckpoint:
+    """
+    Чекпоинт в формате JSONL: по строке на отзыв, только дозапись.
+    Каждая порция результатов сбрасывается на диск (fsync), поэтому после падения
+    теряется не больше одной порции, а запуск продолжается с необработанных отзывов.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+
+    def load(self) -> List[dict]:
+        """
+        Читает уже сохранённые результаты.
+        Оборванная последняя строка (падение во время записи) отрезается.
+        """
+        if not os.path.exists(self.filename):
+            return []
+
+        results = []
+        valid_size = 0
+        with open(self.filename, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    results.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+                valid_size += len(line)
+
+        if valid_size < os.path.getsize(self.filename):
+            print(f"⚠️ Чекпоинт оборван, отрезаем хвост: {self.filename}")
+            with open(self.filename, 'r+b') as f:
+                f.truncate(valid_size)
+        return results
+
+    def append(self, results: List[dict]):
+        if not results:
+            return
+        with open(self.filename, 'a', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        print(f"💾 Чекпоинт: +{len(results)} → {self.filename}")
+
+
 # === НАСТРОЙКИ ===
 # Список категорий (уже составлен)
 categories_list = [
@@ -242,6 +401,12 @@ categories_list = [
     "Прочие услуги"
 ]
 
+# Допустимые тональности (те же, что в SYSTEM_PROMPT)
+sentiments_list = ["позитив", "негатив", "нейтральный"]
+
+# Генерация по JSON схеме (грамматика llama.cpp): только категории и тональности из списков
+CONSTRAINED_DECODING = True
+
 # Системный промпт
 SYSTEM_PROMPT = f"""Ты — эксперт по анализу отзывов клиентов банка.
 Проанализируй отзыв клиента банка и определи, какие продукты или услуги упоминаются, а также тональность отзыва (позитив/негатив/нейтральный)
@@ -271,67 +436,74 @@ TEST_ROWS = None
 # Для classify_test - количество примеров для проверки результатов по категории
 N_SAMPLES_PER_CATEGORY = 3
 
-# Частота сохранения чекпойнтов
-CHECKPOINT_EVERY = 5
-OUTPUT_JSON = "llm_results.json"
+# Параллельная обработка: потоков llama.cpp на процесс и число процессов (1 - в текущем процессе).
+# На GPU всегда один процесс.
+N_THREADS_PER_WORKER = 4
+N_WORKERS = max(1, (os.cpu_count() or 1) // N_THREADS_PER_WORKER)
 
-# === 1. Скачивание модели (если нужно) ===
-if not download_model(MODEL_URL, MODEL_PATH):
-    print("❌ Не удалось скачать модель. Завершение работы.")
-    exit(1)
+# Слоёв модели на GPU: None - определить автоматически (GPU_LAYERS при доступной CUDA), 0 - только CPU
+N_GPU_LAYERS = None
+GPU_LAYERS = 35
 
-# === 2. Чтение данных ===
-df = csv_read("total_data_banki_i_sravni.csv", nrows=TEST_ROWS)
-print(f"✅ Загружено {len(df)} строк")
+# Частота сохранения чекпойнтов (дозапись в OUTPUT_JSONL, при перезапуске готовые отзывы пропускаются)
+CHECKPOINT_EVERY = 5
+OUTPUT_JSONL = "llm_results.jsonl"
+# В конце собрать результаты в один JSON прежнего формата (None - не собирать)
+OUTPUT_JSON = "llm_results.json"
 
-# === 3. Инициализация LLM и классификатора ===
-try:
-    # Автоматическое определение доступности GPU
-    try:
-        import torch
-        gpu_available = torch.cuda.is_available()
-        n_gpu_layers = 35 if gpu_available else 0
-        print(f"🖥️ GPU доступен: {gpu_available}")
-    except ImportError:
-        n_gpu_layers = 0
-        print("🖥️ GPU не обнаружен, используем CPU")
-    
-    llm_engine = LLMLocal(
-        model_path=MODEL_PATH,
-        n_gpu_layers=n_gpu_layers,
-        use_system_role=False      # ⚠️ Важно: эта модель не поддерживает system role
-    )
-    classifier = LLMClassifier(llm_engine, categories_list, SYSTEM_PROMPT)
-    print("✅ LLM и классификатор инициализированы")
-except Exception as e:
-    print(f"🔴 Ошибка: {e}")
-    raise
-
-# === 4. Обработка отзывов ===
-results = []
-
-for idx, row in df.iterrows():
-    review_id = row["id"]
-    text = str(row["text"]).strip()
-
-    print(f"[{idx+1}/{len(df)}] Обработка отзыва {review_id}...")
-    annotation = classifier.classify(text)
-
-    results.append({
-        "id": review_id,
-        "annotations": annotation.get("annotations", [])
-    })
-
-    # Чекпоинт
-    if (idx + 1) % CHECKPOINT_EVERY == 0 or (idx + 1) == len(df):
+if __name__ == "__main__":
+    # === 1. Скачивание модели (если нужно) ===
+    if not download_model(MODEL_URL, MODEL_PATH):
+        print("❌ Не удалось скачать модель. Завершение работы.")
+        exit(1)
+
+    # === 2. Чтение данных ===
+    df = csv_read("total_data_banki_i_sravni.csv", nrows=TEST_ROWS)
+    print(f"✅ Загружено {len(df)} строк")
+    rows = list(zip(df["id"].tolist(), df["text"].astype(str).str.strip().tolist()))
+
+    # Продолжаем с места остановки: отзывы из чекпоинта не обрабатываем повторно
+    checkpoint = JsonlCheckpoint(OUTPUT_JSONL)
+    results = checkpoint.load()
+    done_ids = {result["id"] for result in results}
+    if done_ids:
+        rows = [row for row in rows if row[0] not in done_ids]
+        print(f"🔁 Уже обработано: {len(done_ids)}, осталось: {len(rows)}")
+
+    # === 3. Настройки LLM и классификатора (модели создаются в процессах-обработчиках) ===
+    llm_kwargs = {
+        "model_path": MODEL_PATH,
+        "n_threads": N_THREADS_PER_WORKER,
+        "n_gpu_layers": N_GPU_LAYERS,
+        "use_system_role": False,      # ⚠️ Важно: эта модель не поддерживает system role
+    }
+    classifier_kwargs = {
+        "categories": categories_list,
+        "system_prompt": SYSTEM_PROMPT,
+        "sentiments": sentiments_list,
+        "constrained": CONSTRAINED_DECODING,
+    }
+
+    # === 4. Обработка отзывов ===
+    batch = []
+
+    for idx, result in enumerate(classify_rows(rows, llm_kwargs, classifier_kwargs, N_WORKERS)):
+        print(f"[{idx+1}/{len(rows)}] Обработан отзыв {result['id']}")
+        results.append(result)
+        batch.append(result)
+
+        # Чекпоинт
+        if (idx + 1) % CHECKPOINT_EVERY == 0 or (idx + 1) == len(rows):
+            checkpoint.append(batch)
+            batch = []
+
+    print(f"\n🎉 Обработка завершена! Обработано: {len(results)} отзывов")
+
+
+    # === Запуск теста ===
+    classify_test(results, categories_list, N_SAMPLES_PER_CATEGORY)
+
+    # === 5. Финальное сохранение ===
+    print(f"📤 Результат сохранён: {OUTPUT_JSONL}")
+    if OUTPUT_JSON:
         save_checkpoint(results, OUTPUT_JSON)
-
-print(f"\n🎉 Обработка завершена! Обработано: {len(results)} отзывов")
-
-
-# === Запуск теста ===
-classify_test(results, categories_list, N_SAMPLES_PER_CATEGORY)
-
-# === 5. Финальное сохранение ===
-save_checkpoint(results, OUTPUT_JSON)
-print(f"📤 Результат сохранён: {OUTPUT_JSON}")